@@ -1,58 +1,75 @@
 #!/usr/bin/env python3
 """
-Helper script to add real phone numbers to contacts.csv
+Helper script to add real phone numbers to the contact store
 """
 
-import csv
 import sys
-from src.config.settings import CONTACTS_FILE
+from src.config.settings import CONTACTS_DB, CONTACTS_FILE
+from src.utils.contact_store import open_contacts
+from src.utils.suppression import SuppressionList
 
-def add_contact(number: str):
-    """Add a phone number to contacts.csv"""
+# Show at most this many numbers; the store can hold millions
+SHOW_LIMIT = 50
+
+def add_contact(number: str, tags=()):
+    """Add a phone number to the contact store"""
     number = number.strip()
     
-    # Read existing contacts
-    contacts = []
-    try:
-        with open(CONTACTS_FILE, 'r', newline='') as f:
-            reader = csv.reader(f)
-            contacts = [row[0].strip() for row in reader if row and row[0].strip()]
-    except FileNotFoundError:
-        pass
-    
-    # Check if already exists
-    if number in contacts:
-        print(f"⚠ Number {number} already exists in contacts")
-        return False
-    
-    # Add new contact
-    contacts.append(number)
-    
-    # Write back
-    with open(CONTACTS_FILE, 'w', newline='') as f:
-        writer = csv.writer(f)
-        for contact in contacts:
-            writer.writerow([contact])
+    with open_contacts() as store:
+        if number in store:
+            for tag in tags:
+                store.tag([number], tag)
+            if tags:
+                print(f"✓ {number} already exists in contacts; tagged {', '.join(tags)}")
+            else:
+                print(f"⚠ Number {number} already exists in contacts")
+            return False
+        
+        if not store.add(number, tags):
+            print(f"✗ Invalid phone number: {number}")
+            return False
     
-    print(f"✓ Added {number} to contacts.csv")
+    print(f"✓ Added {number} to {CONTACTS_DB}")
     return True
 
-def show_contacts():
-    """Show all contacts"""
-    try:
-        with open(CONTACTS_FILE, 'r', newline='') as f:
-            reader = csv.reader(f)
-            contacts = [row[0].strip() for row in reader if row and row[0].strip()]
-        
-        print(f"\nCurrent contacts ({len(contacts)}):")
-        for i, contact in enumerate(contacts, 1):
+def import_contacts(path: str = CONTACTS_FILE, tags=()):
+    """Bulk import a one-number-per-line CSV into the contact store"""
+    with open_contacts(warn_stale=False) as store:
+        counts = store.import_csv(path, tags)
+    print(f"✓ Imported {path}: {counts['added']} added, "
+          f"{counts['existing']} already present, {counts['invalid']} invalid")
+    return counts
+
+def opt_out(number: str):
+    """Add a number to the suppression list so no sender contacts it again"""
+    with SuppressionList() as suppression:
+        suppression.add(number, reason="opt-out")
+    print(f"✓ {number} opted out")
+
+def show_contacts(tag=None):
+    """Show contacts (streamed, first SHOW_LIMIT only)"""
+    with open_contacts() as store:
+        total = store.count(tag)
+        label = f"Current contacts in '{tag}'" if tag else "Current contacts"
+        print(f"\n{label} ({total}):")
+        for i, contact in enumerate(store.iter_numbers(tag), 1):
+            if i > SHOW_LIMIT:
+                print(f"  ... and {total - SHOW_LIMIT} more")
+                break
             print(f"  {i}. {contact}")
         print()
-    except FileNotFoundError:
-        print("No contacts file found")
 
 def main():
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and sys.argv[1] == "--import":
+        # Bulk import: add_contacts.py --import [file.csv] [tag]
+        path = sys.argv[2] if len(sys.argv) > 2 else CONTACTS_FILE
+        tags = sys.argv[3:4]
+        import_contacts(path, tags)
+        show_contacts()
+    elif len(sys.argv) > 2 and sys.argv[1] == "--opt-out":
+        # Opt-out: add_contacts.py --opt-out 0712345678
+        opt_out(sys.argv[2])
+    elif len(sys.argv) > 1:
         # Add contact from command line
         number = sys.argv[1]
         add_contact(number)
@@ -60,7 +77,7 @@ def main():
     else:
         # Interactive mode
         print("=" * 60)
-        print("Add Contacts to CSV")
+        print("Add Contacts")
         print("=" * 60)
         print()
         show_contacts()
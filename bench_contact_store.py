@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Contact Store Benchmark
+Measures bulk add, membership lookups and streaming iteration.
+Usage: python bench_contact_store.py [count]   (default 1,000,000; try 10000000)
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.utils.contact_store import ContactStore
+
+LOOKUPS = 100000
+
+
+def timed(label: str, count: int, fn):
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    print(f"  {label:<22} {elapsed:8.2f}s  {count / elapsed:12,.0f} ops/s")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    rng = random.Random(42)
+    # Kenyan mobile numbers in local format, e.g. 07xxxxxxxx
+    numbers = [f"07{n:08d}" for n in rng.sample(range(100_000_000), count)]
+    probes = rng.sample(numbers, LOOKUPS // 2) + [f"01{n:08d}" for n in range(LOOKUPS // 2)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "contacts.db")
+        print(f"{count:,} contacts")
+
+        with ContactStore(path) as store:
+            timed("bulk add", count, lambda: store.upsert_many(numbers))
+            timed("tag 10% segment", count // 10,
+                  lambda: store.upsert_many(numbers[: count // 10], tags=["vip"]))
+            hits = timed("lookup (50% hits)", LOOKUPS, lambda: sum(p in store for p in probes))
+            assert hits == LOOKUPS // 2
+            timed("iterate all", count, lambda: sum(1 for _ in store.iter_numbers()))
+            timed("iterate segment", count // 10, lambda: sum(1 for _ in store.iter_numbers("vip")))
+
+        print(f"  on-disk size           {os.path.getsize(path) / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
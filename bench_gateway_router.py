@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Gateway Router Benchmark
+Starts local stub SMS Gateway servers and measures aggregate throughput
+when routing across 1..N phones.
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from src import sms_sender
+from src.utils.gateway_router import Gateway, GatewayRouter
+
+# Simulated per-message latency of a phone (seconds)
+GATEWAY_LATENCY = 0.05
+MESSAGES = 200
+
+
+class StubGateway(BaseHTTPRequestHandler):
+    """Accepts POST /message like SMS Gateway for Android, after a fixed delay."""
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(GATEWAY_LATENCY)
+        self.send_response(202)
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def start_stub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubGateway)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(servers, workers):
+    gateways = [
+        Gateway(name=f"stub-{i}", ip="127.0.0.1", port=s.server_address[1],
+                user="sms", password="x", sim_slots=[0, 1], capacity=4)
+        for i, s in enumerate(servers)
+    ]
+    router = GatewayRouter(gateways)
+    numbers = [f"0700{i:06d}" for i in range(MESSAGES)]
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        list(pool.map(lambda n: sms_sender.send_sms_routed(router, n, "bench"), numbers))
+    elapsed = time.perf_counter() - start
+    return elapsed, router.stats()
+
+
+def main():
+    # Keep benchmark traffic out of data/sms_log.txt
+    sms_sender.log = lambda *args, **kwargs: None
+
+    max_gateways = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    servers = [start_stub() for _ in range(max_gateways)]
+
+    print(f"{MESSAGES} messages, {GATEWAY_LATENCY * 1000:.0f} ms per message, capacity 4 per phone")
+    for count in range(1, max_gateways + 1):
+        elapsed, stats = run(servers[:count], workers=4 * count)
+        spread = ", ".join(str(s["sent"]) for s in stats.values())
+        print(f"  {count} gateway(s): {elapsed:6.2f}s  {MESSAGES / elapsed:7.1f} msg/s  [{spread}]")
+
+    for server in servers:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
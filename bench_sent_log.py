@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Sent Log Benchmark
+Measures marking messages as sent and checking them on a rerun.
+Usage: python bench_sent_log.py [count]   (default 1,000,000; try 10000000)
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+from src.utils.idempotency import SentLog
+
+LOOKUPS = 100000
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    message = "Hello! This is an automated message."
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sent.db")
+        with SentLog(path) as sent_log:
+            start = time.perf_counter()
+            # Bulk-load the way a long campaign would, one commit per message
+            for i in range(count):
+                sent_log.mark_sent("bench", f"07{i:08d}", message)
+            elapsed = time.perf_counter() - start
+            print(f"{count:,} sent messages")
+            print(f"  mark_sent            {elapsed:8.2f}s  {count / elapsed:10,.0f} ops/s")
+
+            step = max(1, count // LOOKUPS)
+            probes = [f"07{i:08d}" for i in range(0, count, step)][:LOOKUPS]
+            start = time.perf_counter()
+            hits = sum(sent_log.was_sent("bench", n, message) for n in probes)
+            elapsed = time.perf_counter() - start
+            assert hits == len(probes)
+            print(f"  was_sent (rerun)     {elapsed:8.2f}s  {len(probes) / elapsed:10,.0f} ops/s")
+
+        print(f"  on-disk size         {os.path.getsize(path) / 1e6:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+CLI Start-up Benchmark
+Compares cold-start cost of the lazy CLI against importing every sender
+module the old way, with `requests` loaded up front (what the old
+`python -m src.<module>` entry points did).
+Usage: python bench_startup.py [runs]
+"""
+
+import subprocess
+import sys
+import time
+
+CASES = {
+    # Before: every sender imported `requests` at module level
+    "eager (old imports)": "import requests, src.sms_sender, src.call_sender, src.call_sender_automation",
+    "senders (lazy)": "import src.sms_sender, src.call_sender, src.call_sender_automation",
+    "cli --help": "import sys; sys.argv = ['sms-automation', '--help']\n"
+                  "from src.cli import main\ntry:\n main()\nexcept SystemExit:\n pass",
+    "cli stats (imports)": "import src.cli, add_contacts, src.utils.contact_store",
+}
+
+
+def import_time_us(code: str) -> int:
+    """Total import time reported by `python -X importtime` (microseconds)."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True,
+    )
+    total = 0
+    for line in result.stderr.splitlines():
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and not parts[2].startswith("  ") and parts[1].strip().isdigit():
+            total += int(parts[1])
+    return total
+
+
+def wall_time_ms(code: str, runs: int) -> float:
+    start = time.perf_counter()
+    for _ in range(runs):
+        subprocess.run([sys.executable, "-c", code], stdout=subprocess.DEVNULL)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    print(f"{'case':<22} {'imports':>10} {'wall/run':>10}")
+    for label, code in CASES.items():
+        imports = import_time_us(code) / 1000
+        wall = wall_time_ms(code, runs)
+        print(f"{label:<22} {imports:8.1f}ms {wall:8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Suppression List Benchmark
+Measures the per-contact cost of the suppression check while filtering a
+large contact list against a large suppression list.
+Usage: python bench_suppression.py [contacts] [suppressed]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+
+from src.utils.suppression import SuppressionList
+
+
+def main():
+    contacts = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    suppressed = int(sys.argv[2]) if len(sys.argv) > 2 else 100_000
+    rng = random.Random(7)
+    numbers = [f"07{n:08d}" for n in rng.sample(range(100_000_000), contacts)]
+    opted_out = rng.sample(numbers, suppressed)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "suppression.db")
+        with SuppressionList(path) as suppression:
+            suppression.add_many(opted_out)
+
+        start = time.perf_counter()
+        suppression = SuppressionList(path)
+        load = time.perf_counter() - start
+
+        start = time.perf_counter()
+        baseline = sum(1 for _ in numbers)
+        base = time.perf_counter() - start
+
+        start = time.perf_counter()
+        kept = sum(1 for _ in suppression.filter(numbers))
+        elapsed = time.perf_counter() - start
+        suppression.close()
+
+    assert kept == contacts - suppressed == baseline - suppressed
+    print(f"{contacts:,} contacts, {suppressed:,} suppressed")
+    print(f"  load list + build filter {load:8.2f}s")
+    print(f"  filter contacts          {elapsed:8.2f}s  "
+          f"{(elapsed - base) / contacts * 1e6:6.2f} us/contact")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,18 @@ ADB Call Sender
 Uses ADB commands to start and end calls for missed call automation.
 """
 
-import csv
-import time
 import subprocess
 from typing import Optional, Tuple
 from datetime import datetime
 from src.config.settings import (
     CONTACTS_FILE,
-    CALL_DURATION,
     CALL_LOG_FILE,
 )
 from src.utils.adb_controller import run_adb
+from src.utils import tracing
+from src.utils.contact_store import iter_contacts
+from src.utils.suppression import open_suppression
+from src.config.loader import get_config, watch_config
 
 # ----------------------
 # Logging
@@ -61,6 +62,7 @@ def is_valid_number(num: str) -> bool:
 # ----------------------
 # ADB Call Functions
 # ----------------------
+@tracing.traced("call.start", label="number")
 def start_call_via_adb(number: str) -> Tuple[bool, Optional[str]]:
     """
     Start a call using ADB intent.
@@ -81,13 +83,14 @@ def start_call_via_adb(number: str) -> Tuple[bool, Optional[str]]:
             return False, f"ADB error: {stderr}"
         
         # Small delay to let call initiate
-        time.sleep(0.5)
+        tracing.sleep(0.5, "sleep.initiate")
         
         return True, None
         
     except Exception as e:
         return False, f"Failed to start call: {str(e)}"
 
+@tracing.traced("call.end")
 def end_call_via_adb() -> Tuple[bool, Optional[str]]:
     """
     End call using ADB keyevent.
@@ -132,6 +135,52 @@ def test_adb_connection() -> bool:
     except:
         return False
 
+@tracing.traced("call_contact", label="number")
+def call_contact(raw_number: str) -> bool:
+    """
+    Place one missed call via ADB: start, ring for CALL_DURATION, end.
+    Returns True if the call was started and ended cleanly.
+    """
+    number = format_number(raw_number)
+    
+    print(f"Calling {number}...")
+    
+    # Start call using ADB
+    success, error = start_call_via_adb(raw_number)
+    
+    if not success:
+        print(f"  ✗ Failed to start call: {error}")
+        log("failed", raw_number, error or "Failed to start call")
+        return False
+    
+    print(f"  ✓ Call initiated")
+    
+    # Wait for call to start
+    tracing.sleep(1.5, "sleep.connect")
+    
+    # Let it ring briefly (missed call pattern)
+    duration = get_config().CALL_DURATION
+    print(f"  📞 Ringing ({duration}s for missed call)...")
+    tracing.sleep(duration, "sleep.ring")
+    
+    # End call using ADB
+    print(f"  🔚 Ending call...")
+    end_success, end_error = end_call_via_adb()
+    
+    if end_success:
+        print(f"  ✓ Call ended successfully")
+        log("success", raw_number)
+    else:
+        print(f"  ⚠ Could not end call: {end_error}")
+        print(f"  💡 Call may end naturally or already ended")
+    
+    # Wait before next call
+    tracing.sleep(1.0, "sleep.between")
+    
+    print(f"  ✓ Moving to next number...")
+    print()
+    return end_success
+
 # ----------------------
 # Main Function
 # ----------------------
@@ -164,64 +213,32 @@ def main():
     
     print()
     
+    suppression = open_suppression()
+    watcher = watch_config()
+
     try:
-        with open(CONTACTS_FILE, newline="") as csvfile:
-            reader = csv.reader(csvfile)
-            
-            for row in reader:
-                if not row:
-                    continue
-                
-                raw_number = row[0].strip()
-                number = format_number(raw_number)
-                
-                if not is_valid_number(raw_number):
-                    log("failed", raw_number, "Invalid number format")
-                    print(f"✗ Skipping invalid number: {raw_number}")
-                    continue
-                
-                print(f"Calling {number}...")
-                
-                # Start call using ADB
-                success, error = start_call_via_adb(raw_number)
-                
-                if not success:
-                    print(f"  ✗ Failed to start call: {error}")
-                    log("failed", raw_number, error or "Failed to start call")
-                    continue
-                
-                print(f"  ✓ Call initiated")
-                
-                # Wait for call to start
-                time.sleep(1.5)
-                
-                # Let it ring briefly (missed call pattern)
-                print(f"  📞 Ringing ({CALL_DURATION}s for missed call)...")
-                time.sleep(CALL_DURATION)
-                
-                # End call using ADB
-                print(f"  🔚 Ending call...")
-                end_success, end_error = end_call_via_adb()
-                
-                if end_success:
-                    print(f"  ✓ Call ended successfully")
-                    log("success", raw_number)
-                else:
-                    print(f"  ⚠ Could not end call: {end_error}")
-                    print(f"  💡 Call may end naturally or already ended")
-                
-                # Wait before next call
-                time.sleep(1.0)
-                
-                print(f"  ✓ Moving to next number...")
-                print()
-        
+        for raw_number in iter_contacts():
+            if not is_valid_number(raw_number):
+                log("failed", raw_number, "Invalid number format")
+                print(f"✗ Skipping invalid number: {raw_number}")
+                continue
+
+            if raw_number in suppression:
+                print(f"✗ Skipping suppressed number: {raw_number}")
+                continue
+
+            call_contact(raw_number)
+
         print("✓ All calls processed!")
         
     except FileNotFoundError:
         print(f"✗ Error: {CONTACTS_FILE} not found!")
     except Exception as e:
         print(f"✗ Unexpected error: {str(e)}")
+    finally:
+        if watcher:
+            watcher.stop()
+        suppression.close()
 
 if __name__ == "__main__":
     main()
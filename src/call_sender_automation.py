@@ -5,24 +5,18 @@ Works without ADB, root, or Developer Options.
 Uses automation apps that can be controlled via HTTP/API.
 """
 
-import csv
-import time
-import requests
 from typing import Optional, Tuple
 from datetime import datetime
+from src.utils.contact_store import iter_contacts
+from src.utils.suppression import open_suppression
+from src.utils import tracing
+from src.config.loader import get_config, watch_config
 from src.config.settings import (
     CONTACTS_FILE,
-    CALL_DURATION,
     CALL_LOG_FILE,
+    MACRODROID_WEBHOOK_URL,  # start-up value; call_via_macrodroid_webhook reads the live config
 )
 
-# ----------------------
-# Configuration
-# ----------------------
-# MacroDroid Webhook URL
-# Get this from MacroDroid: Settings → Webhooks → Your webhook URL
-MACRODROID_WEBHOOK_URL = "https://trigger.macrodroid.com/914d0a93-042b-402a-ab39-b2543b2b2d4a/call_trigger"  # Replace with your MacroDroid webhook URL
-
 # ----------------------
 # Logging
 # ----------------------
@@ -64,14 +58,18 @@ def is_valid_number(num: str) -> bool:
 # ----------------------
 # Automation App Methods
 # ----------------------
+@tracing.traced("macrodroid.webhook", label="number")
 def call_via_macrodroid_webhook(number: str) -> Tuple[bool, Optional[str]]:
     """
     Trigger call via MacroDroid Webhook URL.
     Requires MacroDroid app with Webhook trigger configured.
     """
-    if not MACRODROID_WEBHOOK_URL or "macrodroid.com" not in MACRODROID_WEBHOOK_URL:
+    webhook_url = get_config().MACRODROID_WEBHOOK_URL
+    if not webhook_url or "macrodroid.com" not in webhook_url:
         return False, "MacroDroid webhook URL not configured correctly"
     
+    import requests  # imported lazily to keep start-up fast
+
     try:
         # MacroDroid webhook format: https://trigger.macrodroid.com/xxxxx/webhook-id
         # You can pass data as query parameters or in the URL path
@@ -80,8 +78,11 @@ def call_via_macrodroid_webhook(number: str) -> Tuple[bool, Optional[str]]:
             "phone_number": number,
             "action": "call"
         }
-        response = requests.get(f"{MACRODROID_WEBHOOK_URL}?{number}", timeout=20)
-        # response = requests.get(MACRODROID_WEBHOOK_URL, params=params, timeout=2)
+        with tracing.span("http.get") as span:
+            response = requests.get(f"{webhook_url}?{number}", timeout=20)
+            span.set(status=response.status_code,
+                     server_ms=round(response.elapsed.total_seconds() * 1000, 3))
+        # response = requests.get(webhook_url, params=params, timeout=2)
         
         # MacroDroid webhooks typically return 200 on success
         if response.status_code == 200:
@@ -95,6 +96,50 @@ def call_via_macrodroid_webhook(number: str) -> Tuple[bool, Optional[str]]:
         return False, f"Error: {str(e)}"
 
 
+@tracing.traced("call_contact", label="number")
+def call_contact(raw_number: str) -> bool:
+    """
+    Trigger one missed call via the MacroDroid webhook and wait CALL_DURATION.
+    Returns True if the webhook accepted the call.
+    """
+    number = format_number(raw_number)
+    
+    print(f"Calling {number} (from {raw_number})...")
+    
+    # Delay to ensure MacroDroid processes previous call
+    # This helps prevent number accumulation and server overload
+    tracing.sleep(1.0, "sleep.before")
+    
+    # Call via MacroDroid webhook with retry logic for timeouts
+    success, error = call_via_macrodroid_webhook(number)
+    
+    # Retry once if timeout occurs (server might be slow after multiple calls)
+    if not success and "timeout" in (error or "").lower():
+        print(f"  ⚠ Timeout detected, retrying in 2s...")
+        tracing.sleep(2.0, "sleep.retry")
+        success, error = call_via_macrodroid_webhook(number)
+    
+    if not success:
+        print(f"  ✗ Failed: {error}")
+        log("failed", raw_number, error or "Failed to trigger call")
+        return False
+    
+    print(f"  ✓ Call triggered")
+    
+    # Wait for call to ring
+    duration = get_config().CALL_DURATION
+    print(f"  📞 Ringing ({duration}s)...")
+    tracing.sleep(duration, "sleep.ring")
+    
+    # Note: Ending calls would require another automation trigger
+    # For now, calls will end naturally or need manual intervention
+    print(f"  ✓ Call completed")
+    
+    tracing.sleep(1.0, "sleep.between")
+    print(f"  ✓ Moving to next number...")
+    print()
+    return True
+
 # ----------------------
 # Main Function
 # ----------------------
@@ -111,68 +156,38 @@ def main():
     print("  1. Install MacroDroid app")
     print("  2. Create macro with Webhook trigger")
     print("  3. Get webhook URL from MacroDroid")
-    print("  4. Update MACRODROID_WEBHOOK_URL in this script")
+    print("  4. Set MACRODROID_WEBHOOK_URL in settings.py or your YAML profile")
     print()
     
     print("Processing calls...")
     print()
     
+    suppression = open_suppression()
+    watcher = watch_config()
+
     try:
-        with open(CONTACTS_FILE, newline="") as csvfile:
-            reader = csv.reader(csvfile)
-            
-            for row in reader:
-                if not row:
-                    continue
-                
-                raw_number = row[0].strip()
-                number = format_number(raw_number)
-                
-                if not is_valid_number(raw_number):
-                    log("failed", raw_number, "Invalid number format")
-                    print(f"✗ Skipping invalid number: {raw_number}")
-                    continue
-                
-                print(f"Calling {number} (from {raw_number})...")
-                
-                # Delay to ensure MacroDroid processes previous call
-                # This helps prevent number accumulation and server overload
-                time.sleep(1.0)
-                
-                # Call via MacroDroid webhook with retry logic for timeouts
-                success, error = call_via_macrodroid_webhook(number)
-                
-                # Retry once if timeout occurs (server might be slow after multiple calls)
-                if not success and "timeout" in (error or "").lower():
-                    print(f"  ⚠ Timeout detected, retrying in 2s...")
-                    time.sleep(2.0)
-                    success, error = call_via_macrodroid_webhook(number)
-                
-                if not success:
-                    print(f"  ✗ Failed: {error}")
-                    log("failed", raw_number, error or "Failed to trigger call")
-                    continue
-                
-                print(f"  ✓ Call triggered")
-                
-                # Wait for call to ring
-                print(f"  📞 Ringing ({CALL_DURATION}s)...")
-                time.sleep(CALL_DURATION)
-                
-                # Note: Ending calls would require another automation trigger
-                # For now, calls will end naturally or need manual intervention
-                print(f"  ✓ Call completed")
-                
-                time.sleep(1.0)
-                print(f"  ✓ Moving to next number...")
-                print()
-        
+        for raw_number in iter_contacts():
+            if not is_valid_number(raw_number):
+                log("failed", raw_number, "Invalid number format")
+                print(f"✗ Skipping invalid number: {raw_number}")
+                continue
+
+            if raw_number in suppression:
+                print(f"✗ Skipping suppressed number: {raw_number}")
+                continue
+
+            call_contact(raw_number)
+
         print("✓ All calls processed!")
         
     except FileNotFoundError:
         print(f"✗ Error: {CONTACTS_FILE} not found!")
     except Exception as e:
         print(f"✗ Unexpected error: {str(e)}")
+    finally:
+        if watcher:
+            watcher.stop()
+        suppression.close()
 
 if __name__ == "__main__":
     main()
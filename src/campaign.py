@@ -0,0 +1,291 @@
+"""
+Campaign Runner
+Splits the contact store into shards by normalized number and runs each
+shard in its own worker process, with its own backend clients and rate
+budget. Shard logs are merged into the normal log file and the per-shard
+metrics into a single campaign report.
+"""
+
+import functools
+import heapq
+import json
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from src.config.loader import get_config, watch_config
+from src.utils import tracing
+from src.config.settings import (
+    CAMPAIGN_DIR,
+    CAMPAIGN_SHARDS,
+    CAMPAIGN_RATE_LIMIT,
+    SMS_CAMPAIGN,
+    LOG_FILE,
+    CALL_LOG_FILE,
+)
+
+CHANNELS = ("sms-adb", "sms-gateway", "call-adb", "call-macrodroid")
+# Channels that drive one ADB device or MacroDroid phone and so cannot run in parallel
+SINGLE_DEVICE_CHANNELS = ("sms-adb", "call-adb", "call-macrodroid")
+
+
+@dataclass
+class ShardJob:
+    """Everything a worker process needs to run one shard."""
+    campaign_id: str
+    channel: str
+    index: int
+    shards: int
+    log_path: str
+    tag: Optional[str] = None
+    rate: Optional[float] = None      # messages/second for this shard
+    workers: int = 1                  # concurrent sends (gateway channel)
+    sim_slot: Optional[int] = None
+    dedupe_campaign: Optional[str] = None  # sent-log campaign name for SMS channels
+    trace_path: Optional[str] = None  # set when the parent process is tracing
+    sample_interval: Optional[float] = None  # the parent's profiler interval (--sample-ms)
+
+
+def _scaled_gateways(entries, shards: int) -> List[Dict]:
+    """Split each phone's capacity between the shards so the fleet isn't oversubscribed."""
+    return [dict(entry, capacity=max(1, entry.get("capacity", 4) // shards)) for entry in entries]
+
+
+def _dispatcher(job: ShardJob):
+    """
+    Import the channel's backend in the worker, point its log at the shard
+    log file and return (send, router or None). SMS senders are called as
+    send(number, message), call senders as send(number).
+    """
+    if job.channel in ("sms-adb", "sms-gateway"):
+        from src import sms_sender
+        from src.utils import logger
+        from src.utils.gateway_router import GatewayRouter
+
+        logger.LOG_FILE = job.log_path
+        if job.channel == "sms-adb":
+            return sms_sender.send_sms, None
+
+        router = GatewayRouter.from_settings(_scaled_gateways(get_config().SMS_GATEWAYS, job.shards))
+        return lambda n, m: sms_sender.send_sms_routed(router, n, m, job.sim_slot), router
+
+    if job.channel == "call-adb":
+        from src import call_sender as backend
+    else:
+        from src import call_sender_automation as backend
+    backend.CALL_LOG_FILE = job.log_path
+    return backend.call_contact, None
+
+
+def run_shard(job: ShardJob) -> Dict:
+    """Worker entry point: dispatch every contact in one shard and return its metrics."""
+    from concurrent.futures import ThreadPoolExecutor
+    from src.utils.contact_store import ContactStore
+    from src.utils.suppression import SuppressionList
+    from src.utils.idempotency import SentLog
+    from src.sms_sender import send_and_record
+
+    if job.trace_path:
+        tracing.start(job.trace_path, job.sample_interval)
+
+    send, router = _dispatcher(job)
+    metrics = {"shard": job.index, "contacts": 0, "sent": 0, "failed": 0, "suppressed": 0,
+               "already_sent": 0}
+    # Expiry already ran in the parent
+    sent_log = SentLog(ttl_days=None) if job.dedupe_campaign else None
+    lock = threading.Lock()
+
+    def record(ok: bool):
+        with lock:
+            metrics["sent" if ok else "failed"] += 1
+
+    def done(future):
+        try:
+            record(future.exception() is None and bool(future.result()))
+        finally:
+            pending.release()
+
+    # Seconds between sends; retune() changes it when CAMPAIGN_RATE_LIMIT is edited
+    pacing = {"interval": 1.0 / job.rate if job.rate else 0.0}
+
+    def retune(config):
+        if router:
+            router.update_gateways(_scaled_gateways(config.SMS_GATEWAYS, job.shards),
+                                   config.SMS_GATEWAY_COOLDOWN)
+        rate = config.CAMPAIGN_RATE_LIMIT
+        with lock:
+            pacing["interval"] = job.shards / rate if rate else 0.0
+
+    watcher = watch_config(on_change=retune)
+    pool = ThreadPoolExecutor(max_workers=job.workers) if job.workers > 1 else None
+    pending = threading.BoundedSemaphore(job.workers * 2)
+    next_slot = time.monotonic()
+    start = time.monotonic()
+
+    try:
+        with ContactStore() as store, SuppressionList() as suppression:
+            for number in store.iter_numbers(job.tag, shard=(job.index, job.shards)):
+                metrics["contacts"] += 1
+                if number in suppression:
+                    metrics["suppressed"] += 1
+                    continue
+
+                if sent_log is not None:
+                    message = get_config().SMS_MESSAGE
+                    if sent_log.was_sent(job.dedupe_campaign, number, message):
+                        metrics["already_sent"] += 1
+                        continue
+                    task = functools.partial(send_and_record, sent_log, job.dedupe_campaign,
+                                             send, number, message)
+                else:
+                    task = functools.partial(send, number)
+
+                # Rate budget: space sends evenly at this shard's share of the limit
+                with lock:
+                    interval = pacing["interval"]
+                if interval:
+                    delay = next_slot - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    next_slot = max(next_slot, time.monotonic()) + interval
+
+                if pool:
+                    pending.acquire()
+                    future = pool.submit(task)
+                    future.add_done_callback(done)
+                else:
+                    record(bool(task()))
+    finally:
+        if pool:
+            pool.shutdown(wait=True)
+        if watcher:
+            watcher.stop()
+        if sent_log is not None:
+            sent_log.close()
+        tracing.stop()
+
+    metrics["elapsed"] = round(time.monotonic() - start, 3)
+    if router:
+        metrics["gateways"] = router.stats()
+    return metrics
+
+
+def _merge_logs(paths: List[str], target: str):
+    """Append shard logs to the main log in timestamp order, then remove them."""
+    files = [open(p) for p in paths if os.path.exists(p)]
+    try:
+        with open(target, "a") as out:
+            # Each shard log is already in time order; lines start with "[YYYY-mm-dd HH:MM:SS]"
+            out.writelines(heapq.merge(*files, key=lambda line: line[:21]))
+    finally:
+        for f in files:
+            f.close()
+    for f in files:
+        os.remove(f.name)
+
+
+def _summarize(campaign_id: str, channel: str, shard_metrics: List[Dict], elapsed: float) -> Dict:
+    totals = {key: sum(m[key] for m in shard_metrics)
+              for key in ("contacts", "sent", "failed", "suppressed", "already_sent")}
+    report = {
+        "campaign": campaign_id,
+        "channel": channel,
+        "shards": len(shard_metrics),
+        "elapsed": round(elapsed, 3),
+        "throughput": round(totals["sent"] / elapsed, 2) if elapsed else 0.0,
+        **totals,
+        "per_shard": sorted(shard_metrics, key=lambda m: m["shard"]),
+    }
+
+    gateways = {}
+    for m in shard_metrics:
+        for name, counts in m.get("gateways", {}).items():
+            merged = gateways.setdefault(name, {"sent": 0, "failures": 0})
+            merged["sent"] += counts["sent"]
+            merged["failures"] += counts["failures"]
+    if gateways:
+        report["gateways"] = gateways
+    return report
+
+
+def run_campaign(channel: str = "sms-gateway", shards: Optional[int] = None,
+                 tag: Optional[str] = None, rate: Optional[float] = CAMPAIGN_RATE_LIMIT,
+                 workers: int = 4, sim_slot: Optional[int] = None,
+                 campaign_id: Optional[str] = None) -> Dict:
+    """
+    Run a campaign across `shards` worker processes.
+    shards: None -> CAMPAIGN_SHARDS for the gateway fleet, 1 for single-device channels
+    rate: total messages/second, split evenly between shards (None = unlimited)
+    workers: concurrent sends per shard for the gateway channel
+    campaign_id: also names the campaign in the sent log; rerun with the same id to resume
+    Returns the campaign report (also written to CAMPAIGN_DIR/<id>/report.json).
+    """
+    if channel not in CHANNELS:
+        raise ValueError(f"Unknown channel {channel!r}, expected one of {', '.join(CHANNELS)}")
+    if shards is None:
+        shards = 1 if channel in SINGLE_DEVICE_CHANNELS else CAMPAIGN_SHARDS
+    elif shards > 1 and channel in SINGLE_DEVICE_CHANNELS:
+        # Parallel shards would interleave keystrokes/calls on the same device
+        raise ValueError(f"{channel} drives a single device and cannot be sharded; "
+                         f"only sms-gateway supports shards > 1")
+
+    from src.utils.contact_store import open_contacts
+    from src.utils.suppression import open_suppression
+    from src.utils.idempotency import SentLog
+
+    # One-off writes (CSV import, log scan, sent-log expiry) happen here, before workers start
+    open_contacts().close()
+    open_suppression().close()
+    SentLog().close()
+
+    # Reruns under the same id (or without one) skip numbers that already got the message
+    dedupe_campaign = (campaign_id or SMS_CAMPAIGN) if channel.startswith("sms") else None
+    campaign_id = campaign_id or datetime.now().strftime("%Y%m%d-%H%M%S")
+    campaign_dir = os.path.join(CAMPAIGN_DIR, campaign_id)
+    os.makedirs(campaign_dir, exist_ok=True)
+
+    jobs = [
+        ShardJob(
+            campaign_id=campaign_id,
+            channel=channel,
+            index=i,
+            shards=shards,
+            log_path=os.path.join(campaign_dir, f"shard-{i}.log"),
+            tag=tag,
+            rate=rate / shards if rate else None,
+            workers=workers if channel == "sms-gateway" else 1,
+            sim_slot=sim_slot,
+            dedupe_campaign=dedupe_campaign,
+            trace_path=os.path.join(campaign_dir, f"shard-{i}.trace.json") if tracing.is_enabled() else None,
+            sample_interval=tracing.sample_interval(),
+        )
+        for i in range(shards)
+    ]
+
+    print(f"Campaign {campaign_id}: {channel}, {shards} shard(s)")
+    start = time.monotonic()
+    with ProcessPoolExecutor(max_workers=shards) as pool:
+        shard_metrics = list(pool.map(run_shard, jobs))
+    elapsed = time.monotonic() - start
+
+    log_file = LOG_FILE if channel.startswith("sms") else CALL_LOG_FILE
+    _merge_logs([job.log_path for job in jobs], log_file)
+    if tracing.is_enabled():
+        trace_path = os.path.join(campaign_dir, "trace.json")
+        tracing.merge_traces([job.trace_path for job in jobs], trace_path)
+        if tracing.sample_interval():
+            tracing.merge_folded([job.trace_path + ".folded" for job in jobs], trace_path + ".folded")
+
+    report = _summarize(campaign_id, channel, shard_metrics, elapsed)
+    report["jobs"] = [asdict(job) for job in jobs]
+    with open(os.path.join(campaign_dir, "report.json"), "w") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"✓ {report['sent']} sent, {report['failed']} failed, {report['suppressed']} suppressed, "
+          f"{report['already_sent']} already sent of {report['contacts']} contacts in {report['elapsed']}s ({report['throughput']}/s)")
+    print(f"  Report: {os.path.join(campaign_dir, 'report.json')}")
+    return report
@@ -0,0 +1,166 @@
+"""
+sms-automation command-line entry point
+
+    python -m src.cli send-sms [--gateway] [--sim-slot N] [--workers N]
+    python -m src.cli call [--method adb|macrodroid]
+    python -m src.cli add-contacts [NUMBER ...] [--import FILE] [--tag TAG] [--opt-out NUMBER]
+    python -m src.cli campaign [--channel sms-gateway] [--shards N] [--rate N] [--tag TAG]
+    python -m src.cli stats
+    python -m src.cli --profile production,fleet-b send-sms --gateway
+    python -m src.cli --trace data/trace.json --sample-ms 5 send-sms --gateway
+
+Only argparse is imported up front; each subcommand imports its backend
+when it runs, so e.g. `stats` never loads `requests`.
+"""
+
+import argparse
+import os
+import sys
+
+
+def cmd_send_sms(args):
+    from src.sms_sender import main as send_main
+    from src.config.settings import SMS_CAMPAIGN
+    send_main(use_gateway=args.gateway, sim_slot=args.sim_slot, workers=args.workers,
+              campaign=args.campaign or SMS_CAMPAIGN)
+
+
+def cmd_call(args):
+    if args.method == "adb":
+        from src.call_sender import main as call_main
+    else:
+        from src.call_sender_automation import main as call_main
+    call_main()
+
+
+def cmd_add_contacts(args):
+    import add_contacts
+
+    if args.opt_out:
+        for number in args.opt_out:
+            add_contacts.opt_out(number)
+    if args.import_file:
+        add_contacts.import_contacts(args.import_file, args.tag)
+    for number in args.numbers:
+        add_contacts.add_contact(number, args.tag)
+    add_contacts.show_contacts()
+
+
+def cmd_campaign(args):
+    from src.campaign import run_campaign
+
+    # Leave unset options to the CAMPAIGN_* settings
+    overrides = {k: v for k, v in (("shards", args.shards), ("rate", args.rate)) if v is not None}
+    try:
+        run_campaign(channel=args.channel, tag=args.tag, workers=args.workers,
+                     sim_slot=args.sim_slot, campaign_id=args.id, **overrides)
+    except ValueError as e:
+        sys.exit(f"Error: {e}")
+
+
+def _count_log(path: str):
+    """Count SUCCESS/FAILED lines in a sender log without loading it."""
+    success = failed = 0
+    try:
+        with open(path) as f:
+            for line in f:
+                if "] SUCCESS - " in line:
+                    success += 1
+                elif "] FAILED - " in line:
+                    failed += 1
+    except FileNotFoundError:
+        pass
+    return success, failed
+
+
+def cmd_stats(args):
+    from src.config.settings import LOG_FILE, CALL_LOG_FILE
+    from src.utils.contact_store import open_contacts
+    from src.utils.suppression import SuppressionList
+    from src.utils.idempotency import SentLog
+
+    with open_contacts() as store:
+        print(f"Contacts:    {store.count()}")
+        for tag, size in sorted(store.tags().items()):
+            print(f"  [{tag}] {size}")
+
+    with SuppressionList() as suppression:
+        print(f"Suppressed:  {len(suppression)}")
+
+    with SentLog() as sent_log:
+        print(f"Sent log:    {len(sent_log)} messages")
+
+    for label, path in (("SMS log", LOG_FILE), ("Call log", CALL_LOG_FILE)):
+        success, failed = _count_log(path)
+        print(f"{label + ':':<12} {success} success, {failed} failed ({path})")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="sms-automation", description="SMS and missed-call automation")
+    parser.add_argument("--profile", help="YAML profile(s) from config/, comma separated")
+    parser.add_argument("--trace", metavar="FILE", help="write a Chrome trace of the run (TRACE_FILE)")
+    parser.add_argument("--sample-ms", type=float, metavar="MS",
+                        help="also sample stacks every MS milliseconds (<FILE>.folded)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    p = sub.add_parser("send-sms", help="send SMS_MESSAGE to all contacts")
+    p.add_argument("--gateway", action="store_true", help="use the SMS Gateway fleet instead of ADB")
+    p.add_argument("--sim-slot", type=int, default=None, help="force SIM slot (0/1)")
+    p.add_argument("--workers", type=int, default=4, help="messages in flight in gateway mode")
+    p.add_argument("--campaign", help="sent-log campaign name; reruns skip numbers already sent (SMS_CAMPAIGN)")
+    p.set_defaults(func=cmd_send_sms)
+
+    p = sub.add_parser("call", help="missed-call all contacts")
+    p.add_argument("--method", choices=("adb", "macrodroid"), default="macrodroid")
+    p.set_defaults(func=cmd_call)
+
+    p = sub.add_parser("add-contacts", help="add, import or opt out contacts")
+    p.add_argument("numbers", nargs="*", help="numbers to add")
+    p.add_argument("--import", dest="import_file", metavar="FILE", help="bulk import a CSV")
+    p.add_argument("--tag", action="append", default=[], help="segment tag for added numbers")
+    p.add_argument("--opt-out", action="append", default=[], metavar="NUMBER",
+                   help="add a number to the suppression list")
+    p.set_defaults(func=cmd_add_contacts)
+
+    p = sub.add_parser("campaign", help="sharded multi-process run over the contact store")
+    p.add_argument("--channel", default="sms-gateway",
+                   choices=("sms-adb", "sms-gateway", "call-adb", "call-macrodroid"))
+    p.add_argument("--shards", type=int, default=None,
+                   help="worker processes (CAMPAIGN_SHARDS); sms-gateway only")
+    p.add_argument("--rate", type=float, default=None, help="total messages/second (CAMPAIGN_RATE_LIMIT)")
+    p.add_argument("--workers", type=int, default=4, help="concurrent sends per shard (gateway)")
+    p.add_argument("--sim-slot", type=int, default=None, help="force SIM slot (0/1)")
+    p.add_argument("--tag", help="only contacts in this segment")
+    p.add_argument("--id", help="campaign id (default: timestamp); reuse it to resume an SMS campaign")
+    p.set_defaults(func=cmd_campaign)
+
+    p = sub.add_parser("stats", help="contact, suppression and log counts")
+    p.set_defaults(func=cmd_stats)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        # Must be set before any subcommand imports settings
+        os.environ["SMS_AUTOMATION_PROFILE"] = args.profile
+
+    from src.config.settings import TRACE_FILE, TRACE_SAMPLE_INTERVAL
+    trace_file = args.trace or TRACE_FILE
+    if not trace_file:
+        args.func(args)
+        return 0
+
+    from src.utils import tracing
+    interval = args.sample_ms / 1000 if args.sample_ms else TRACE_SAMPLE_INTERVAL
+    tracing.start(trace_file, interval)
+    try:
+        args.func(args)
+    finally:
+        print(f"Trace written to {tracing.stop()}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,245 @@
+"""
+Config Loader
+YAML profiles layered over the defaults in settings.py.
+
+Profiles live in config/<name>.yaml and are selected with the
+SMS_AUTOMATION_PROFILE environment variable; several can be stacked,
+e.g. SMS_AUTOMATION_PROFILE=production,fleet-b (later ones win).
+Keys are the setting names from settings.py:
+
+    CALL_DURATION: 15
+    SMS_GATEWAYS:
+      - {name: phone-1, ip: 192.168.1.102, port: 8080, user: sms, password: x}
+
+Without SMS_GATEWAYS the fleet is the single phone from SMS_GATEWAY_IP/PORT/
+USER/PASS, so overriding just those keys works too.
+
+Profiles are applied to settings.py once at import, so paths and other
+start-up values follow the profile. Values that can be retuned during a run
+are read through get_config(), which returns an immutable, cached Config;
+watch_config() re-parses the profile files when they change on disk.
+"""
+
+import os
+import threading
+from collections.abc import Mapping
+from types import MappingProxyType
+from typing import Callable, Dict, List, Optional
+
+PROFILE_DIR = "config"
+PROFILE_ENV = "SMS_AUTOMATION_PROFILE"
+
+_defaults: Dict = {}
+_config = None
+_lock = threading.Lock()
+
+
+def _freeze(value):
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class Config(Mapping):
+    """Read-only view of the merged settings; use attributes or [] to read."""
+
+    __slots__ = ("_values",)
+
+    def __init__(self, values: Dict):
+        object.__setattr__(self, "_values", MappingProxyType({k: _freeze(v) for k, v in values.items()}))
+
+    def __getitem__(self, name):
+        return self._values[name]
+
+    def __iter__(self):
+        return iter(self._values)
+
+    def __len__(self):
+        return len(self._values)
+
+    def __getattr__(self, name):
+        try:
+            return self._values[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Config is read-only")
+
+
+def profile_paths(profile: Optional[str] = None) -> List[str]:
+    """Files for the selected profile(s), in the order they are applied."""
+    names = profile if profile is not None else os.environ.get(PROFILE_ENV, "")
+    paths = []
+    for name in filter(None, (n.strip() for n in names.split(","))):
+        path = name if name.endswith((".yaml", ".yml")) else os.path.join(PROFILE_DIR, f"{name}.yaml")
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Config profile not found: {path}")
+        paths.append(path)
+    return paths
+
+
+# Settings whose default is None, and what a profile may set them to instead
+_OPTIONAL_TYPES = {
+    "CAMPAIGN_RATE_LIMIT": (int, float),
+    "TRACE_FILE": (str,),
+    "TRACE_SAMPLE_INTERVAL": (int, float),
+}
+
+
+def _type_error(name: str, value) -> Optional[str]:
+    """Why `value` cannot replace the default of setting `name` (None if it can)."""
+    default = _defaults[name]
+    if default is None:
+        allowed = _OPTIONAL_TYPES.get(name)
+        if value is None or allowed is None:
+            return None
+    elif isinstance(default, (int, float)) and not isinstance(default, bool):
+        allowed = (int, float)  # numbers stay numbers; 1 -> 0.5 is fine
+    else:
+        allowed = (type(default),)
+    if isinstance(value, allowed) and not (isinstance(value, bool) and bool not in allowed):
+        return None
+    expected = " or ".join(t.__name__ for t in allowed)
+    return f"{name} must be {expected}, got {value!r}"
+
+
+def read_profiles(paths: List[str]) -> Dict:
+    """
+    Parse and merge profile files. Unknown keys and values whose type does not
+    match the default (e.g. SMS_DELAY: "1s") are rejected to catch typos.
+    """
+    if not paths:
+        return {}
+    import yaml  # only needed when a profile is selected
+
+    values = {}
+    for path in paths:
+        with open(path) as f:
+            data = yaml.safe_load(f) or {}
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: expected a mapping of setting names")
+        unknown = sorted(k for k in data if k not in _defaults)
+        if unknown:
+            raise ValueError(f"{path}: unknown setting(s): {', '.join(unknown)}")
+        errors = [e for e in (_type_error(k, v) for k, v in data.items()) if e]
+        if errors:
+            raise ValueError(f"{path}: {'; '.join(errors)}")
+        values.update(data)
+    return values
+
+
+def _merge(overrides: Dict) -> Dict:
+    """Defaults + profile overrides, with the derived settings filled in."""
+    values = {**_defaults, **overrides}
+    if not values["SMS_GATEWAYS"]:
+        # Single phone from SMS_GATEWAY_*, built after the overlay so profiles can change it
+        values["SMS_GATEWAYS"] = [{
+            "name": "phone-1",
+            "ip": values["SMS_GATEWAY_IP"],
+            "port": values["SMS_GATEWAY_PORT"],
+            "user": values["SMS_GATEWAY_USER"],
+            "password": values["SMS_GATEWAY_PASS"],
+        }]
+    return values
+
+
+def apply_profile(namespace: Dict):
+    """
+    Called at the end of settings.py: remember the defaults, then overlay
+    the selected profile onto the module's globals.
+    """
+    global _config
+    _defaults.update({k: v for k, v in namespace.items() if k.isupper()})
+    overrides = read_profiles(profile_paths())
+    values = _merge(overrides)
+    namespace.update(overrides)
+    namespace["SMS_GATEWAYS"] = values["SMS_GATEWAYS"]
+    _config = Config(values)
+
+
+def get_config() -> Config:
+    """Current settings. Cheap to call per message: returns the cached object."""
+    if _config is None:
+        import src.config.settings  # noqa: F401  (runs apply_profile)
+    return _config
+
+
+def _validate(values: Dict):
+    """Reject values the running senders could not use, before they are installed."""
+    from src.utils.gateway_router import validate_gateways
+    validate_gateways(values["SMS_GATEWAYS"])
+
+
+def reload_config() -> Config:
+    """Re-read the profile files and swap in a new Config (unchanged if they are invalid)."""
+    global _config
+    get_config()  # settings.py must have registered the defaults (known keys) first
+    values = _merge(read_profiles(profile_paths()))
+    _validate(values)
+    with _lock:
+        _config = Config(values)
+    return _config
+
+
+class ConfigWatcher:
+    """
+    Polls the profile files' mtimes and reloads the config when they change.
+    A profile that fails to parse or validate is reported and the previous
+    config kept; errors from on_change are reported and polling continues.
+    """
+
+    def __init__(self, interval: float = 2.0, on_change: Optional[Callable[[Config], None]] = None):
+        self.interval = interval
+        self.on_change = on_change
+        self._stop = threading.Event()
+        self._mtimes = self._stat()
+        self._thread = threading.Thread(target=self._run, name="config-watcher", daemon=True)
+
+    def _stat(self):
+        mtimes = {}
+        for path in profile_paths():
+            try:
+                mtimes[path] = os.stat(path).st_mtime_ns
+            except OSError:
+                mtimes[path] = None
+        return mtimes
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                mtimes = self._stat()
+            except FileNotFoundError as e:
+                print(f"⚠ {e}")
+                continue
+            if mtimes == self._mtimes:
+                continue
+            self._mtimes = mtimes
+            try:
+                config = reload_config()
+            except Exception as e:
+                print(f"⚠ Config reload failed, keeping previous settings: {e}")
+                continue
+            print("✓ Config reloaded")
+            if self.on_change:
+                try:
+                    self.on_change(config)
+                except Exception as e:
+                    print(f"⚠ Applying reloaded config failed: {e}")
+
+    def start(self) -> "ConfigWatcher":
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+
+
+def watch_config(interval: float = 2.0, on_change=None) -> Optional[ConfigWatcher]:
+    """Start a watcher if a profile is selected; returns None otherwise."""
+    get_config()
+    if not profile_paths():
+        return None
+    return ConfigWatcher(interval, on_change).start()
@@ -1,8 +1,12 @@
 # Predefined message to send
 SMS_MESSAGE = "Hello! This is an automated message."
 
+# Delay between messages (seconds) for ADB/emulator
+SMS_DELAY = 1
+
 # Paths
 CONTACTS_FILE = "data/contacts.csv"
+CONTACTS_DB = "data/contacts.db"      # indexed contact store (imported from CONTACTS_FILE on first use)
 LOG_FILE = "data/sms_log.txt"
 
 # SMS Gateway for Android settings
@@ -11,9 +15,46 @@ SMS_GATEWAY_PORT = 8080             # phone port
 SMS_GATEWAY_USER = "sms"            # username from app
 SMS_GATEWAY_PASS = "SpJive4L"       # password from app
 
+# Multi-phone gateway fleet
+# Each entry is one phone running SMS Gateway for Android, e.g.
+#   {"name": "phone-1", "ip": "192.168.1.102", "port": 8080, "user": "sms",
+#    "password": "...", "sim_slots": [0, 1], "weight": 1, "capacity": 4}
+# weight   -> relative share of traffic (e.g. 2 = twice as many messages)
+# capacity -> max messages in flight on that phone before it counts as saturated
+# sim_slots -> SIM slots the router may use on that phone (rotated per message)
+# Empty -> one phone built from the SMS_GATEWAY_* settings above (after any
+# profile overrides, see loader.py)
+SMS_GATEWAYS = []
+
+# Seconds an unhealthy gateway is skipped before the router tries it again
+SMS_GATEWAY_COOLDOWN = 30
+
 # Call automation settings
 CALL_DURATION = 20  # seconds to let call ring (1-2 rings for missed call)
 CALL_LOG_FILE = "data/call_log.txt"
 
+# MacroDroid Webhook URL
+# Get this from MacroDroid: Settings → Webhooks → Your webhook URL
+MACRODROID_WEBHOOK_URL = "https://trigger.macrodroid.com/914d0a93-042b-402a-ab39-b2543b2b2d4a/call_trigger"  # Replace with your MacroDroid webhook URL
+
+# Opt-out / suppression list
+SUPPRESSION_DB = "data/suppression.db"
+SUPPRESSION_BLOOM_ERROR_RATE = 0.001  # false-positive rate of the in-memory filter
+
+# Idempotent sends - a (campaign, number, message) is only sent once
+SMS_CAMPAIGN = "default"              # campaign name used by send-sms unless given
+SENT_DB = "data/sent.db"
+IDEMPOTENCY_TTL_DAYS = 30             # forget sends older than this
+
+# Sharded campaign runner
+CAMPAIGN_DIR = "data/campaigns"       # per-campaign report.json
+CAMPAIGN_SHARDS = 4                   # worker processes (sms-gateway; device channels use 1)
+CAMPAIGN_RATE_LIMIT = None            # messages/second across all shards (None = unlimited)
 
+# Tracing (off by default) - Chrome trace JSON, open in chrome://tracing or ui.perfetto.dev
+TRACE_FILE = None                     # e.g. "data/trace.json"
+TRACE_SAMPLE_INTERVAL = None          # seconds between profiler stack samples (None = off)
 
+# Overlay the YAML profile selected by SMS_AUTOMATION_PROFILE (see loader.py)
+from src.config.loader import apply_profile
+apply_profile(globals())
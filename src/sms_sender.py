@@ -1,102 +1,236 @@
-import csv
-import time
-import requests
+import functools
+import threading
+from typing import Optional
 from src.utils.adb_controller import run_adb
+from src.utils.contact_store import iter_contacts
+from src.utils.suppression import open_suppression
+from src.utils.gateway_router import GatewayRouter
+from src.utils.idempotency import SentLog
 from src.utils.logger import log
+from src.utils import tracing
 from src.utils.validator import is_valid_number
+from src.config.loader import get_config, watch_config
 from src.config.settings import (
-    SMS_MESSAGE,
     CONTACTS_FILE,
+    SMS_CAMPAIGN,
     SMS_GATEWAY_IP,
     SMS_GATEWAY_PORT,
     SMS_GATEWAY_USER,
     SMS_GATEWAY_PASS
 )
 
-# Delay between messages (seconds) for ADB/emulator
-DELAY = 1
+# `requests` and the thread pool are imported inside the gateway functions so
+# the ADB path (and the CLI) start without loading them.
 
-def send_sms(number: str, message: str):
+def _adb(command: str):
+    """
+    run_adb() that raises instead of returning stderr (adb missing, no device...),
+    so a message is never reported as sent when the device did nothing.
+    """
+    _, error = run_adb(command)
+    if error:
+        raise RuntimeError(error if error.startswith("ADB error") else f"ADB error: {error}")
+
+
+@tracing.traced("send_sms", label="number")
+def send_sms(number: str, message: str) -> bool:
     """
     Sends SMS via emulator/ADB.
     """
     try:
-        run_adb(f"am start -a android.intent.action.SENDTO -d sms:{number}")
-        time.sleep(1)
+        _adb(f"am start -a android.intent.action.SENDTO -d sms:{number}")
+        tracing.sleep(1, "sleep.compose")
 
-        run_adb(f"input text '{message}'")
-        time.sleep(1)
+        _adb(f"input text '{message}'")
+        tracing.sleep(1, "sleep.typed")
 
-        run_adb("input keyevent 22")  # focus send
-        run_adb("input keyevent 66")  # press send
-        time.sleep(DELAY)
+        _adb("input keyevent 22")  # focus send
+        _adb("input keyevent 66")  # press send
+        tracing.sleep(get_config().SMS_DELAY, "sleep.delay")
 
         log("success", number)
+        return True
 
     except Exception as e:
         log("failed", number, str(e))
+        return False
 
 
-def send_sms_gateway(number: str, message: str, sim_slot: int = 0, retries: int = 3):
+def _post_sms(url: str, auth, number: str, message: str, sim_slot: int):
     """
-    Sends SMS via SMS Gateway for Android with retry logic.
+    Submits one message to an SMS Gateway endpoint. Raises on HTTP/connection errors.
     """
-    url = f"http://{SMS_GATEWAY_IP}:{SMS_GATEWAY_PORT}/message"
+    import requests
+
     payload = {
         "textMessage": {"text": message},
         "phoneNumbers": [number],
         "simSlot": sim_slot
     }
+    with tracing.span("http.post", url=url) as span:
+        response = requests.post(url, json=payload, auth=auth, timeout=10)
+        # elapsed = request sent -> response headers parsed (gateway latency);
+        # the rest of the span is connection setup and client overhead
+        span.set(status=response.status_code,
+                 server_ms=round(response.elapsed.total_seconds() * 1000, 3))
+    response.raise_for_status()
+
+
+@tracing.traced("send_sms_gateway", label="number")
+def send_sms_gateway(number: str, message: str, sim_slot: int = 0, retries: int = 3) -> bool:
+    """
+    Sends SMS via SMS Gateway for Android with retry logic.
+    """
+    import requests
+
+    url = f"http://{SMS_GATEWAY_IP}:{SMS_GATEWAY_PORT}/message"
 
     for attempt in range(1, retries + 1):
         try:
-            response = requests.post(
-                url,
-                json=payload,
-                auth=(SMS_GATEWAY_USER, SMS_GATEWAY_PASS),
-                timeout=10
-            )
-            response.raise_for_status()
+            _post_sms(url, (SMS_GATEWAY_USER, SMS_GATEWAY_PASS), number, message, sim_slot)
             log("success", number)
-            return
+            return True
         except requests.RequestException as e:
             print(f"Attempt {attempt} failed for {number}: {e}")
             if attempt == retries:
                 log("failed", number, str(e))
             else:
-                time.sleep(2)  # wait 2 seconds before retry
+                tracing.sleep(2, "sleep.retry")  # wait 2 seconds before retry
+    return False
 
 
-def main(use_gateway=False, sim_slot=0):
+@tracing.traced("send_sms_routed")
+def send_sms_routed(router: GatewayRouter, number: str, message: str,
+                    sim_slot: Optional[int] = None, retries: int = 3) -> bool:
     """
-    Reads CSV and sends messages.
-    use_gateway: True -> SMS Gateway; False -> emulator/ADB
-    sim_slot: 0 or 1 for dual-SIM phones
+    Sends SMS through whichever gateway the router picks.
+    A failed attempt is retried on another phone (or, once every phone has
+    been tried, on the same ones after 2 seconds). Connection errors and 5xx
+    put the phone on cooldown; 4xx are treated as specific to this message.
+    sim_slot: None -> rotate through the chosen gateway's sim_slots
     """
+    import requests
+
+    tried = set()
+    error = "No healthy SMS gateway available"
+
+    for attempt in range(1, retries + 1):
+        with tracing.span("gateway.acquire", number=number) as span:
+            gateway = router.acquire(exclude=tried)
+            if gateway is None and tried:
+                # Every phone has been tried once - give them a moment and start over
+                tracing.sleep(2, "sleep.retry")
+                tried.clear()
+                gateway = router.acquire()
+            span.set(gateway=gateway.name if gateway else None)
+        if gateway is None:
+            break
+
+        slot = router.next_sim_slot(gateway) if sim_slot is None else sim_slot
+        try:
+            _post_sms(gateway.url, gateway.auth, number, message, slot)
+        except requests.RequestException as e:
+            response = getattr(e, "response", None)
+            router.release(gateway, ok=False,
+                           unhealthy=response is None or response.status_code >= 500)
+            tried.add(gateway.name)
+            error = f"{gateway.name}: {e}"
+            print(f"Attempt {attempt} failed for {number} via {gateway.name}: {e}")
+            continue
+
+        router.release(gateway, ok=True)
+        log("success", number)
+        return True
+
+    log("failed", number, error)
+    return False
+
+
+def send_and_record(sent_log: SentLog, campaign: str, send, number: str, message: str, *args) -> bool:
+    """
+    Sends via `send(number, message, *args)` and records it in the sent log
+    only if it returned True, so a rerun of the same campaign skips this
+    number but retries every failed one.
+    """
+    ok = send(number, message, *args)
+    if ok:
+        sent_log.mark_sent(campaign, number, message)
+    return ok
+
+
+def main(use_gateway=False, sim_slot=None, workers=1, campaign=SMS_CAMPAIGN):
+    """
+    Reads contacts and sends messages.
+    use_gateway: True -> SMS Gateway fleet (SMS_GATEWAYS); False -> emulator/ADB
+    sim_slot: 0 or 1 to force a SIM on dual-SIM phones; None -> each gateway's sim_slots
+    workers: messages submitted concurrently in gateway mode
+    campaign: numbers that already got this campaign's message are skipped (rerun-safe)
+    """
+    from concurrent.futures import ThreadPoolExecutor
+
+    router = GatewayRouter.from_settings() if use_gateway else None
+    pool = ThreadPoolExecutor(max_workers=workers) if use_gateway else None
+    # Bound the pool's queue so huge contact lists are streamed, not buffered
+    pending = threading.BoundedSemaphore(workers * 2)
+    suppression = open_suppression()
+    sent_log = SentLog()
+
+    def retune(config):
+        # Pick up edited gateway endpoints/capacities without stopping dispatch
+        if router:
+            router.update_gateways(config.SMS_GATEWAYS, config.SMS_GATEWAY_COOLDOWN)
+
+    watcher = watch_config(on_change=retune)
+
+    def finished(number, future):
+        # send_and_record only raises on unexpected errors; log them instead of losing them
+        error = future.exception()
+        if error is not None:
+            log("failed", number, f"Unexpected error: {error}")
+        pending.release()
+
     try:
-        with open(CONTACTS_FILE, newline="") as csvfile:
-            reader = csv.reader(csvfile)
-            for row in reader:
-                if not row:
-                    continue
-                number = row[0].strip()
-
-                if not is_valid_number(number):
-                    log("failed", number, "Invalid phone number")
-                    continue
-
-                print(f"Sending SMS to {number}...")
-                if use_gateway:
-                    send_sms_gateway(number, SMS_MESSAGE, sim_slot)
-                else:
-                    send_sms(number, SMS_MESSAGE)
+        for number in iter_contacts():
+            if not is_valid_number(number):
+                log("failed", number, "Invalid phone number")
+                continue
+
+            if number in suppression:
+                print(f"Skipping suppressed number {number}")
+                continue
+
+            message = get_config().SMS_MESSAGE
+            if sent_log.was_sent(campaign, number, message):
+                print(f"Already sent to {number} in campaign '{campaign}', skipping")
+                continue
+
+            print(f"Sending SMS to {number}...")
+            if use_gateway:
+                pending.acquire()
+                future = pool.submit(send_and_record, sent_log, campaign,
+                                     lambda n, m: send_sms_routed(router, n, m, sim_slot),
+                                     number, message)
+                future.add_done_callback(functools.partial(finished, number))
+            else:
+                send_and_record(sent_log, campaign, send_sms, number, message)
 
+        if pool:
+            pool.shutdown(wait=True)
+            for name, counts in router.stats().items():
+                print(f"  {name}: {counts['sent']} sent, {counts['failures']} failed attempts")
         print("All messages processed!")
 
     except FileNotFoundError:
         print(f"Error: {CONTACTS_FILE} not found!")
     except Exception as e:
         print(f"Unexpected error: {str(e)}")
+    finally:
+        if pool:
+            pool.shutdown(wait=True)
+        if watcher:
+            watcher.stop()
+        suppression.close()
+        sent_log.close()
 
 
 if __name__ == "__main__":
@@ -104,4 +238,6 @@ if __name__ == "__main__":
     # Emulator/ADB:
     # main(use_gateway=False)
     # Real phone (SIM1):
-    main(use_gateway=True, sim_slot=0)
+    # main(use_gateway=True, sim_slot=0)
+    # Phone fleet from SMS_GATEWAYS, 4 messages in flight:
+    main(use_gateway=True, workers=4)
@@ -0,0 +1,241 @@
+"""
+Contact Store
+SQLite-backed contact list keyed by the normalized 64-bit phone number.
+Replaces the flat contacts.csv: O(log n) lookups, batched upserts,
+tags/segments and streaming iteration for the senders.
+"""
+
+import csv
+import os
+import sqlite3
+from typing import Iterable, Iterator, Optional, Tuple
+
+from src.config.settings import CONTACTS_DB, CONTACTS_FILE
+from src.utils.validator import format_local, normalize_number
+
+BATCH_SIZE = 10000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS contacts (
+    number INTEGER PRIMARY KEY
+);
+CREATE TABLE IF NOT EXISTS contact_tags (
+    tag TEXT NOT NULL,
+    number INTEGER NOT NULL,
+    PRIMARY KEY (tag, number)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS csv_imports (
+    path TEXT PRIMARY KEY,
+    mtime INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def _batched(items: Iterable, size: int = BATCH_SIZE) -> Iterator[list]:
+    batch = []
+    for item in items:
+        batch.append(item)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ContactStore:
+    """
+    Contacts stored as INTEGER PRIMARY KEY (the table's B-tree key), so
+    membership checks and inserts are O(log n) and nothing is held in memory.
+    """
+
+    def __init__(self, path: str = CONTACTS_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def __contains__(self, number) -> bool:
+        key = number if isinstance(number, int) else normalize_number(number)
+        if key is None:
+            return False
+        row = self.conn.execute("SELECT 1 FROM contacts WHERE number = ?", (key,)).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        return self.count()
+
+    def count(self, tag: Optional[str] = None) -> int:
+        if tag is None:
+            return self.conn.execute("SELECT COUNT(*) FROM contacts").fetchone()[0]
+        return self.conn.execute(
+            "SELECT COUNT(*) FROM contact_tags WHERE tag = ?", (tag,)
+        ).fetchone()[0]
+
+    def add(self, number: str, tags: Iterable[str] = ()) -> bool:
+        """
+        Add a single number. Returns False if it is invalid or already stored.
+        """
+        key = normalize_number(number)
+        if key is None:
+            return False
+        with self.conn:
+            cur = self.conn.execute("INSERT OR IGNORE INTO contacts (number) VALUES (?)", (key,))
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO contact_tags (tag, number) VALUES (?, ?)",
+                [(tag, key) for tag in tags],
+            )
+        return cur.rowcount == 1
+
+    def upsert_many(self, numbers: Iterable[str], tags: Iterable[str] = ()) -> dict:
+        """
+        Bulk insert numbers in batches (one transaction per batch).
+        Returns counts of added, existing and invalid numbers.
+        """
+        tags = list(tags)
+        counts = {"added": 0, "existing": 0, "invalid": 0}
+
+        for batch in _batched(numbers):
+            keys = []
+            for number in batch:
+                key = number if isinstance(number, int) else normalize_number(number)
+                if key is None:
+                    counts["invalid"] += 1
+                else:
+                    keys.append((key,))
+
+            with self.conn:
+                before = self.conn.total_changes
+                self.conn.executemany("INSERT OR IGNORE INTO contacts (number) VALUES (?)", keys)
+                added = self.conn.total_changes - before
+                for tag in tags:
+                    self.conn.executemany(
+                        "INSERT OR IGNORE INTO contact_tags (tag, number) VALUES (?, ?)",
+                        [(tag, key) for (key,) in keys],
+                    )
+            counts["added"] += added
+            counts["existing"] += len(keys) - added
+        return counts
+
+    def remove(self, number: str) -> bool:
+        key = normalize_number(number)
+        if key is None:
+            return False
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM contacts WHERE number = ?", (key,))
+            self.conn.execute("DELETE FROM contact_tags WHERE number = ?", (key,))
+        return cur.rowcount == 1
+
+    def tag(self, numbers: Iterable[str], tag: str) -> int:
+        """Add stored numbers to a segment. Returns how many were tagged."""
+        keys = [(tag, k) for k in (normalize_number(n) for n in numbers) if k is not None]
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO contact_tags (tag, number) "
+                "SELECT ?, number FROM contacts WHERE number = ?",
+                keys,
+            )
+            return self.conn.total_changes - before
+
+    def untag(self, numbers: Iterable[str], tag: str):
+        keys = [(tag, k) for k in (normalize_number(n) for n in numbers) if k is not None]
+        with self.conn:
+            self.conn.executemany("DELETE FROM contact_tags WHERE tag = ? AND number = ?", keys)
+
+    def tags(self) -> dict:
+        """Segment name -> size."""
+        rows = self.conn.execute("SELECT tag, COUNT(*) FROM contact_tags GROUP BY tag")
+        return dict(rows.fetchall())
+
+    def iter_keys(self, tag: Optional[str] = None, batch: int = BATCH_SIZE,
+                  shard: Optional[Tuple[int, int]] = None) -> Iterator[int]:
+        """
+        Stream normalized numbers in ascending order without loading them all.
+        shard: (index, count) -> only numbers with number % count == index
+        """
+        where, params = [], []
+        if tag is not None:
+            where.append("tag = ?")
+            params.append(tag)
+        if shard is not None:
+            where.append("number % ? = ?")
+            params.extend((shard[1], shard[0]))
+        table = "contacts" if tag is None else "contact_tags"
+        sql = f"SELECT number FROM {table}"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        cur = self.conn.execute(sql + " ORDER BY number", params)
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                break
+            for (number,) in rows:
+                yield number
+
+    def iter_numbers(self, tag: Optional[str] = None,
+                     shard: Optional[Tuple[int, int]] = None) -> Iterator[str]:
+        """Stream numbers in local format (what the senders expect)."""
+        for number in self.iter_keys(tag, shard=shard):
+            yield format_local(number)
+
+    def import_csv(self, path: str = CONTACTS_FILE, tags: Iterable[str] = ()) -> dict:
+        """Import numbers from a one-number-per-row CSV file."""
+        mtime = os.stat(path).st_mtime_ns
+        with open(path, newline="") as f:
+            reader = csv.reader(f)
+            numbers = (row[0].strip() for row in reader if row and row[0].strip())
+            counts = self.upsert_many(numbers, tags)
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO csv_imports (path, mtime) VALUES (?, ?)",
+                (os.path.abspath(path), mtime),
+            )
+        return counts
+
+    def csv_changed(self, path: str = CONTACTS_FILE) -> bool:
+        """True if the CSV was modified after it was last imported (or never imported)."""
+        if not os.path.exists(path):
+            return False
+        row = self.conn.execute(
+            "SELECT mtime FROM csv_imports WHERE path = ?", (os.path.abspath(path),)
+        ).fetchone()
+        if row is None:
+            # Stores created before imports were recorded: compare with the database file
+            return os.path.getmtime(path) > os.path.getmtime(self.path)
+        return os.stat(path).st_mtime_ns > row[0]
+
+
+def open_contacts(path: str = CONTACTS_DB, csv_path: str = CONTACTS_FILE,
+                  warn_stale: bool = True) -> ContactStore:
+    """
+    Open the contact store, importing the legacy CSV the first time it is created.
+    Afterwards the CSV is no longer read; warn if it was edited since its import.
+    """
+    is_new = not os.path.exists(path)
+    store = ContactStore(path)
+    if is_new and os.path.exists(csv_path):
+        counts = store.import_csv(csv_path)
+        print(f"Imported {counts['added']} contacts from {csv_path} "
+              f"({counts['invalid']} invalid skipped)")
+    elif warn_stale and store.csv_changed(csv_path):
+        print(f"⚠ {csv_path} changed since it was imported into {path}; the senders only read "
+              f"{path}. Run: python add_contacts.py --import {csv_path}")
+    return store
+
+
+def iter_contacts(tag: Optional[str] = None) -> Iterator[str]:
+    """Stream contacts for the senders from the default store."""
+    if not os.path.exists(CONTACTS_DB) and not os.path.exists(CONTACTS_FILE):
+        raise FileNotFoundError(CONTACTS_FILE)
+    with open_contacts() as store:
+        yield from store.iter_numbers(tag)
@@ -0,0 +1,185 @@
+"""
+Gateway Router
+Spreads SMS traffic across several phones running SMS Gateway for Android.
+"""
+
+import threading
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from src.config.settings import SMS_GATEWAYS, SMS_GATEWAY_COOLDOWN
+
+
+@dataclass
+class Gateway:
+    """One phone running SMS Gateway for Android."""
+    name: str
+    ip: str
+    port: int
+    user: str
+    password: str
+    sim_slots: List[int] = field(default_factory=lambda: [0])
+    weight: int = 1
+    capacity: int = 4
+
+    # Runtime state (managed by GatewayRouter)
+    in_flight: int = 0
+    sent: int = 0
+    failures: int = 0
+    down_until: float = 0.0
+    _next_slot: int = 0
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.ip}:{self.port}/message"
+
+    @property
+    def auth(self):
+        return (self.user, self.password)
+
+    def is_healthy(self, now: float) -> bool:
+        return now >= self.down_until
+
+    def is_saturated(self) -> bool:
+        return self.in_flight >= self.capacity
+
+
+def validate_gateways(entries) -> List[Gateway]:
+    """Build Gateway objects from SMS_GATEWAYS entries; ValueError names the bad entry."""
+    gateways = []
+    for i, entry in enumerate(entries):
+        name = entry.get("name", f"#{i + 1}") if isinstance(entry, Mapping) else f"#{i + 1}"
+        try:
+            gateway = Gateway(**entry)
+        except TypeError as e:
+            raise ValueError(f"SMS_GATEWAYS entry {name}: {e}") from None
+        if not gateway.weight > 0:
+            raise ValueError(f"SMS_GATEWAYS entry {name}: weight must be > 0")
+        if not gateway.capacity >= 1:
+            raise ValueError(f"SMS_GATEWAYS entry {name}: capacity must be at least 1")
+        if not gateway.sim_slots:
+            raise ValueError(f"SMS_GATEWAYS entry {name}: sim_slots must not be empty")
+        gateways.append(gateway)
+    if not gateways:
+        raise ValueError("At least one gateway is required")
+    return gateways
+
+
+class GatewayRouter:
+    """
+    Picks a gateway for each message based on weight, queue depth and health.
+
+    The gateway with the lowest in_flight/weight ratio wins; saturated or
+    unhealthy phones are skipped so traffic fails over to the others. The
+    last healthy phone is never put on cooldown, so a single-phone fleet
+    keeps taking retries instead of going dark.
+    Thread-safe, so one router can be shared by several sender threads.
+    """
+
+    def __init__(self, gateways: List[Gateway], cooldown: float = SMS_GATEWAY_COOLDOWN):
+        if not gateways:
+            raise ValueError("At least one gateway is required")
+        self.gateways = gateways
+        self.cooldown = cooldown
+        self._lock = threading.Lock()
+        self._available = threading.Condition(self._lock)
+
+    @classmethod
+    def from_settings(cls, entries: Optional[List[Dict]] = None) -> "GatewayRouter":
+        """Build a router from the SMS_GATEWAYS setting (or a list of dicts)."""
+        entries = SMS_GATEWAYS if entries is None else entries
+        return cls(validate_gateways(entries))
+
+    def update_gateways(self, entries: List[Dict], cooldown: Optional[float] = None):
+        """
+        Swap in a new gateway list (e.g. after a config reload) without
+        losing in-flight counts and stats of phones that are still listed.
+        """
+        gateways = validate_gateways(entries)
+        with self._available:
+            current = {g.name: g for g in self.gateways}
+            for gateway in gateways:
+                old = current.get(gateway.name)
+                if old is not None:
+                    gateway.in_flight, gateway.sent = old.in_flight, old.sent
+                    gateway.failures, gateway.down_until = old.failures, old.down_until
+            self.gateways = gateways
+            if cooldown is not None:
+                self.cooldown = cooldown
+            self._available.notify_all()
+
+    def _pick(self, exclude) -> Optional[Gateway]:
+        now = time.monotonic()
+        candidates = [
+            g for g in self.gateways
+            if g.name not in exclude and g.is_healthy(now) and not g.is_saturated()
+        ]
+        if not candidates:
+            return None
+        return min(candidates, key=lambda g: ((g.in_flight + 1) / g.weight, g.sent / g.weight))
+
+    def acquire(self, exclude=(), timeout: Optional[float] = None) -> Optional[Gateway]:
+        """
+        Reserve a slot on the best available gateway.
+        Blocks while every gateway is saturated or cooling down (until the
+        earliest cooldown ends); returns None if all are excluded or the
+        timeout expires.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._available:
+            while True:
+                gateway = self._pick(exclude)
+                if gateway is not None:
+                    gateway.in_flight += 1
+                    return gateway
+
+                candidates = [g for g in self.gateways if g.name not in exclude]
+                if not candidates:
+                    return None
+
+                now = time.monotonic()
+                remaining = None if deadline is None else deadline - now
+                if remaining is not None and remaining <= 0:
+                    return None
+                if not any(g.is_healthy(now) for g in candidates):
+                    # Nothing frees a slot early; wake when the first cooldown ends
+                    recovery = min(g.down_until for g in candidates) - now
+                    remaining = recovery if remaining is None else min(remaining, recovery)
+                self._available.wait(remaining)
+
+    def next_sim_slot(self, gateway: Gateway) -> int:
+        """Rotate through the phone's SIM slots."""
+        with self._available:
+            slot = gateway.sim_slots[gateway._next_slot % len(gateway.sim_slots)]
+            gateway._next_slot += 1
+            return slot
+
+    def release(self, gateway: Gateway, ok: bool, unhealthy: bool = False):
+        """
+        Return a slot and record the outcome.
+        unhealthy: the phone itself failed (connection error, 5xx) -> put it on
+        cooldown while another phone can take the traffic. Per-message errors
+        (4xx) only count as a failure.
+        """
+        with self._available:
+            # The gateway list may have been swapped by update_gateways() meanwhile
+            gateway = next((g for g in self.gateways if g.name == gateway.name), gateway)
+            gateway.in_flight -= 1
+            if ok:
+                gateway.sent += 1
+            else:
+                gateway.failures += 1
+                now = time.monotonic()
+                if unhealthy and any(g is not gateway and g.is_healthy(now) for g in self.gateways):
+                    gateway.down_until = now + self.cooldown
+            self._available.notify_all()
+
+    def stats(self) -> Dict[str, Dict]:
+        """Per-gateway counters for end-of-run summaries."""
+        with self._lock:
+            return {
+                g.name: {"sent": g.sent, "failures": g.failures, "in_flight": g.in_flight}
+                for g in self.gateways
+            }
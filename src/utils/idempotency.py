@@ -0,0 +1,94 @@
+"""
+Sent Log (idempotent submission)
+Remembers which (campaign, number, message) combinations were already sent,
+so rerunning a campaign after a partial failure only sends to the rest.
+
+Each entry is a 64-bit hash stored as the SQLite INTEGER PRIMARY KEY plus
+the day it was sent, with O(log n) checks. Including the sent_day index
+that is ~37 bytes per message on disk (36.6 MB per million, see
+bench_sent_log.py). Entries older than IDEMPOTENCY_TTL_DAYS are expired on open.
+
+A send is recorded only after it succeeded, so a crash between the two can
+still repeat that one message (at-least-once delivery).
+"""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from src.config.settings import SENT_DB, IDEMPOTENCY_TTL_DAYS
+from src.utils.validator import normalize_number
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sent (
+    key INTEGER PRIMARY KEY,
+    day INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS sent_day ON sent (day);
+"""
+
+
+def _today() -> int:
+    return int(time.time() // 86400)
+
+
+def message_key(campaign: str, number: str, message: str) -> int:
+    """Signed 64-bit hash of campaign + normalized number + rendered message."""
+    normalized = normalize_number(number)
+    ident = str(normalized) if normalized is not None else number.strip()
+    digest = hashlib.blake2b(
+        f"{campaign}\0{ident}\0{message}".encode(), digest_size=8
+    ).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class SentLog:
+    """
+    Persistent set of sent message keys. Safe to share between sender threads.
+    """
+
+    def __init__(self, path: str = SENT_DB, ttl_days: Optional[int] = IDEMPOTENCY_TTL_DAYS):
+        self.path = path
+        self._lock = threading.Lock()
+        # Campaign shards write from several processes; wait for the lock instead of failing
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        if ttl_days:
+            self.expire(ttl_days)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        with self._lock:
+            self.conn.close()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM sent").fetchone()[0]
+
+    def was_sent(self, campaign: str, number: str, message: str) -> bool:
+        key = message_key(campaign, number, message)
+        with self._lock:
+            row = self.conn.execute("SELECT 1 FROM sent WHERE key = ?", (key,)).fetchone()
+        return row is not None
+
+    def mark_sent(self, campaign: str, number: str, message: str):
+        key = message_key(campaign, number, message)
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO sent (key, day) VALUES (?, ?)", (key, _today())
+            )
+
+    def expire(self, ttl_days: int = IDEMPOTENCY_TTL_DAYS) -> int:
+        """Forget entries older than ttl_days. Returns how many were removed."""
+        with self._lock, self.conn:
+            cur = self.conn.execute("DELETE FROM sent WHERE day < ?", (_today() - ttl_days,))
+        return cur.rowcount
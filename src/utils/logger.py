@@ -1,6 +1,5 @@
 from datetime import datetime
-
-LOG_FILE = "data/sms_log.txt"
+from src.config.settings import LOG_FILE
 
 def log(status: str, number: str, error: str = ""):
     """
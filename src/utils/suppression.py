@@ -0,0 +1,238 @@
+"""
+Suppression List
+Numbers that must not be contacted (opt-outs and invalid numbers).
+An in-memory Bloom filter answers "definitely not suppressed" for almost
+every contact; only filter hits are confirmed against the exact on-disk set.
+"""
+
+import math
+import os
+import re
+import sqlite3
+import time
+from typing import Iterable, Iterator, Optional
+
+from src.config.settings import (
+    LOG_FILE,
+    CALL_LOG_FILE,
+    SUPPRESSION_DB,
+    SUPPRESSION_BLOOM_ERROR_RATE,
+)
+from src.utils.validator import normalize_number
+
+# Minimum Bloom filter size, so a small list can grow without degrading
+MIN_CAPACITY = 100000
+
+# "[2025-12-04 03:58:58] FAILED - 0784jghtf - Invalid number format"
+FAILED_LINE = re.compile(r"^\[[^\]]+\] FAILED - (\S+) - (.*)$")
+
+# Only errors that are about the number itself count against it. Anything else
+# (gateway 4xx/5xx, ADB, webhook, API or network errors) is our side and ignored.
+# The number failed validation -> suppressed at once if it is still invalid today
+INVALID_FAILURES = ("invalid number format", "invalid phone number")
+# The recipient opted out -> suppressed at once
+OPT_OUT_FAILURES = ("opted out", "opt-out", "unsubscribed")
+# Setup errors that can quote the phrases above (e.g. a 400 body) are never held against a number
+SETUP_FAILURES = ("client error", "server error", "adb error", "webhook", "gateway",
+                  "authentication", "unauthorized", "connection", "timed out", "timeout")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suppressed (
+    number TEXT PRIMARY KEY,
+    reason TEXT,
+    added_at TEXT
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS log_offsets (
+    path TEXT PRIMARY KEY,
+    offset INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+def suppression_key(number: str) -> str:
+    """
+    Key used for the list: the normalized number when valid, so "0712345678"
+    and "+254712345678" match; otherwise the raw stripped text.
+    """
+    key = normalize_number(number)
+    return str(key) if key is not None else number.strip()
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over string keys.
+    Uses Python's built-in hash with double hashing, so it is only valid
+    in the process that built it (it is rebuilt from disk on every open).
+    """
+
+    def __init__(self, capacity: int, error_rate: float = SUPPRESSION_BLOOM_ERROR_RATE):
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray(self.size // 8 + 1)
+
+    def _positions(self, key: str):
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        h1, h2 = h & 0xFFFFFFFF, (h >> 32) | 1
+        size = self.size
+        for i in range(self.hashes):
+            yield (h1 + i * h2) % size
+
+    def add(self, key: str):
+        bits = self.bits
+        for p in self._positions(key):
+            bits[p >> 3] |= 1 << (p & 7)
+
+    def __contains__(self, key: str) -> bool:
+        # Inlined probe loop: most lookups are misses and stop at the first clear bit
+        h = hash(key) & 0xFFFFFFFFFFFFFFFF
+        p, step = h & 0xFFFFFFFF, (h >> 32) | 1
+        bits, size = self.bits, self.size
+        for _ in range(self.hashes):
+            p %= size
+            if not bits[p >> 3] & (1 << (p & 7)):
+                return False
+            p += step
+        return True
+
+
+class SuppressionList:
+    """
+    Exact suppression set in SQLite fronted by a BloomFilter.
+    Senders call `number in suppression` (or filter()) before dispatch.
+    """
+
+    def __init__(self, path: str = SUPPRESSION_DB):
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(SCHEMA)
+        self._load_filter()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self.conn.close()
+
+    def _load_filter(self):
+        count = self.conn.execute("SELECT COUNT(*) FROM suppressed").fetchone()[0]
+        self.bloom = BloomFilter(max(MIN_CAPACITY, count * 2))
+        for (key,) in self.conn.execute("SELECT number FROM suppressed"):
+            self.bloom.add(key)
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM suppressed").fetchone()[0]
+
+    def __contains__(self, number: str) -> bool:
+        key = suppression_key(number)
+        if key not in self.bloom:
+            return False
+        row = self.conn.execute("SELECT 1 FROM suppressed WHERE number = ?", (key,)).fetchone()
+        return row is not None
+
+    def add(self, number: str, reason: str = "opt-out"):
+        self.add_many([number], reason)
+
+    def add_many(self, numbers: Iterable[str], reason: str = "opt-out"):
+        added_at = time.strftime("%Y-%m-%d %H:%M:%S")
+        keys = [suppression_key(n) for n in numbers]
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO suppressed (number, reason, added_at) VALUES (?, ?, ?)",
+                [(key, reason, added_at) for key in keys],
+            )
+        for key in keys:
+            self.bloom.add(key)
+
+    def remove(self, number: str) -> bool:
+        """
+        Remove a number (e.g. it opted back in). The Bloom filter keeps its bits,
+        which only costs an extra exact lookup for that number until the next open.
+        """
+        key = suppression_key(number)
+        with self.conn:
+            cur = self.conn.execute("DELETE FROM suppressed WHERE number = ?", (key,))
+        return cur.rowcount == 1
+
+    def reason(self, number: str) -> Optional[str]:
+        row = self.conn.execute(
+            "SELECT reason FROM suppressed WHERE number = ?", (suppression_key(number),)
+        ).fetchone()
+        return row[0] if row else None
+
+    def filter(self, numbers: Iterable[str]) -> Iterator[str]:
+        """Yield only the numbers that are not suppressed."""
+        for number in numbers:
+            if number not in self:
+                yield number
+
+    def import_logs(self, paths: Iterable[str] = (LOG_FILE, CALL_LOG_FILE)) -> int:
+        """
+        Scan sender logs for FAILED entries written since the last scan.
+        Invalid numbers and opt-outs are suppressed; all other errors are
+        ignored.
+        Returns how many numbers were newly suppressed.
+        """
+        newly = 0
+        for path in paths:
+            if not os.path.exists(path):
+                continue
+            row = self.conn.execute(
+                "SELECT offset FROM log_offsets WHERE path = ?", (path,)
+            ).fetchone()
+            offset = row[0] if row else 0
+            if offset > os.path.getsize(path):
+                offset = 0  # log was rotated/truncated
+
+            with open(path) as f:
+                f.seek(offset)
+                lines = f.readlines()
+                offset = f.tell()
+
+            for line in lines:
+                newly += self._record_failure(line.rstrip("\n"))
+
+            with self.conn:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO log_offsets (path, offset) VALUES (?, ?)",
+                    (path, offset),
+                )
+        return newly
+
+    def _record_failure(self, line: str) -> int:
+        match = FAILED_LINE.match(line)
+        if not match:
+            return 0
+        number, error = match.groups()
+        error = error.lower()
+        if any(f in error for f in SETUP_FAILURES):
+            return 0
+
+        if any(f in error for f in INVALID_FAILURES):
+            # Logged by an older/looser validator? Only suppress what is still invalid.
+            if normalize_number(number) is not None:
+                return 0
+        elif not any(f in error for f in OPT_OUT_FAILURES):
+            return 0
+
+        key = suppression_key(number)
+        already = key in self.bloom and self.conn.execute(
+            "SELECT 1 FROM suppressed WHERE number = ?", (key,)
+        ).fetchone()
+        if already:
+            return 0
+
+        self.add(number, reason=f"log: {error}")
+        return 1
+
+
+def open_suppression(path: str = SUPPRESSION_DB) -> SuppressionList:
+    """Open the suppression list and pick up new failures from the sender logs."""
+    suppression = SuppressionList(path)
+    newly = suppression.import_logs()
+    if newly:
+        print(f"Suppressed {newly} more number(s) based on failure logs")
+    return suppression
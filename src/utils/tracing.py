@@ -0,0 +1,229 @@
+"""
+Tracing
+Span-style timing around each stage of the send pipeline (ADB spawns,
+HTTP requests, gateway latency, fixed sleeps), exported as Chrome trace
+JSON (open in chrome://tracing or https://ui.perfetto.dev).
+
+Tracing is off by default and span() is then a shared no-op, so the
+instrumentation costs next to nothing. An optional sampling profiler
+records the stacks of all threads every few milliseconds and writes them
+in collapsed-stack format (<trace file>.folded) for flame graphs.
+"""
+
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+_events: Optional[List[Dict]] = None
+_trace_file: Optional[str] = None
+_sampler = None
+
+# Chrome traces use absolute microseconds; perf_counter gives precise durations
+_origin_wall = time.time()
+_origin_perf = time.perf_counter()
+
+
+def _now_us(perf: float) -> float:
+    return (_origin_wall + (perf - _origin_perf)) * 1e6
+
+
+class _Span:
+    __slots__ = ("name", "args", "start")
+
+    def __init__(self, name: str, args: Dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        if exc_type is not None:
+            self.args["error"] = repr(exc)
+        events = _events
+        if events is not None:
+            events.append({
+                "name": self.name,
+                "cat": self.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": round(_now_us(self.start), 3),
+                "dur": round((end - self.start) * 1e6, 3),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": self.args,
+            })
+        return False
+
+    def set(self, **args):
+        """Attach extra data discovered inside the span (status code, gateway name...)."""
+        self.args.update(args)
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def set(self, **args):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str, **args):
+    """
+    Time a block:  with span("adb", cmd=command): ...
+    Names use "<stage>.<detail>"; the part before the dot becomes the trace category.
+    """
+    if _events is None:
+        return _NULL_SPAN
+    return _Span(name, args)
+
+
+def traced(name: str, label: Optional[str] = None):
+    """
+    Decorator version of span(). With `label`, the first positional argument
+    is recorded under that name (e.g. the phone number).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _events is None:
+                return func(*args, **kwargs)
+            span_args = {label: args[0]} if label and args else {}
+            with _Span(name, span_args):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def sleep(seconds: float, name: str = "sleep"):
+    """time.sleep that shows up in the trace, so fixed delays are visible per contact."""
+    with span(name, seconds=seconds):
+        time.sleep(seconds)
+
+
+def is_enabled() -> bool:
+    return _events is not None
+
+
+class _Sampler(threading.Thread):
+    """Samples every other thread's stack at a fixed interval."""
+
+    def __init__(self, interval: float):
+        super().__init__(name="trace-sampler", daemon=True)
+        self.interval = interval
+        self.stacks = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            for tid, frame in sys._current_frames().items():
+                if tid == self.ident:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                    frame = frame.f_back
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+def sample_interval() -> Optional[float]:
+    """Interval of the running sampling profiler, or None when it is off."""
+    return _sampler.interval if _sampler is not None else None
+
+
+def start(path: str, sample_interval: Optional[float] = None):
+    """Enable tracing for this process; stop() writes the trace to `path`."""
+    global _events, _trace_file, _sampler
+    _events = []
+    _trace_file = path
+    # A forked worker inherits the parent's sampler (and its samples) but not its thread
+    _sampler = None
+    if sample_interval:
+        _sampler = _Sampler(sample_interval)
+        _sampler.start()
+
+
+def stop() -> Optional[str]:
+    """Disable tracing and write the Chrome trace (and .folded samples). Returns the path."""
+    global _events, _trace_file, _sampler
+    if _events is None:
+        return None
+    events, path = _events, _trace_file
+    _events, _trace_file = None, None
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+
+    if _sampler is not None:
+        _sampler.stop()
+        with open(path + ".folded", "w") as f:
+            for stack, count in _sampler.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        _sampler = None
+
+    export_chrome_trace(path, events)
+    return path
+
+
+def _thread_names(events: List[Dict]) -> List[Dict]:
+    names = {t.ident: t.name for t in threading.enumerate()}
+    seen = {(e["pid"], e["tid"]) for e in events}
+    return [
+        {"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+         "args": {"name": names.get(tid, str(tid))}}
+        for pid, tid in seen if pid == os.getpid()
+    ]
+
+
+def export_chrome_trace(path: str, events: List[Dict]):
+    """Write events in the Chrome trace event format."""
+    with open(path, "w") as f:
+        json.dump({"traceEvents": _thread_names(events) + events, "displayTimeUnit": "ms"}, f)
+
+
+def merge_traces(paths: List[str], target: str):
+    """Combine traces from several processes (e.g. campaign shards) into one file."""
+    events = []
+    for p in paths:
+        if os.path.exists(p):
+            with open(p) as f:
+                events.extend(json.load(f)["traceEvents"])
+            os.remove(p)
+    with open(target, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def merge_folded(paths: List[str], target: str):
+    """Sum collapsed-stack samples from several processes into one .folded file."""
+    stacks = Counter()
+    for p in paths:
+        if os.path.exists(p):
+            with open(p) as f:
+                for line in f:
+                    stack, _, count = line.rstrip("\n").rpartition(" ")
+                    if stack:
+                        stacks[stack] += int(count)
+            os.remove(p)
+    with open(target, "w") as f:
+        for stack, count in stacks.most_common():
+            f.write(f"{stack} {count}\n")
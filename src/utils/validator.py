@@ -5,3 +5,35 @@ def is_valid_number(number: str) -> bool:
     - At least 10 characters
     """
     return number.isdigit() and len(number) >= 10
+
+
+def normalize_number(number: str):
+    """
+    Normalize a phone number to international digits as an int
+    (e.g. "0712 345 678" / "+254712345678" -> 254712345678).
+    Returns None if the number is not valid.
+    """
+    num = number.strip().replace(" ", "")
+    if num.startswith("+"):
+        num = num[1:]
+
+    if not num.isdigit():
+        return None
+
+    # Local format (07xxxxxxxx) or local without leading 0 (7xxxxxxxx)
+    if num.startswith("0") and len(num) == 10:
+        num = "254" + num[1:]
+    elif len(num) == 9:
+        num = "254" + num
+
+    if len(num) < 10 or len(num) > 15:
+        return None
+    return int(num)
+
+
+def format_local(number: int) -> str:
+    """Inverse of normalize_number for Kenyan numbers: 254712345678 -> "0712345678"."""
+    num = str(number)
+    if num.startswith("254") and len(num) == 12:
+        return "0" + num[3:]
+    return num
@@ -21,7 +21,7 @@ def test_webhook():
         print("  1. Open MacroDroid app")
         print("  2. Create a macro with Webhook trigger")
         print("  3. Copy the webhook URL")
-        print("  4. Update MACRODROID_WEBHOOK_URL in src/call_sender_automation.py")
+        print("  4. Set MACRODROID_WEBHOOK_URL in src/config/settings.py or your YAML profile")
         print()
         print("Current URL:", MACRODROID_WEBHOOK_URL or "Not set")
         return
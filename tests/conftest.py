@@ -0,0 +1,17 @@
+"""
+Shared fixtures.
+"""
+
+import pytest
+
+from src import sms_sender
+from src.utils import tracing
+
+
+@pytest.fixture
+def logged(monkeypatch):
+    """Capture sms_sender log calls and skip tracing.sleep pauses (retries, delays)."""
+    entries = []
+    monkeypatch.setattr(sms_sender, "log", lambda *args: entries.append(args))
+    monkeypatch.setattr(tracing, "sleep", lambda *args: None)
+    return entries
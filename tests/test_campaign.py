@@ -0,0 +1,112 @@
+"""
+Campaign runner: sharding rules, a full sharded run and the merged report.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.campaign import SINGLE_DEVICE_CHANNELS, _summarize, run_campaign
+from src.config import loader
+from src.config.loader import reload_config
+from src.config.settings import CAMPAIGN_DIR, LOG_FILE
+
+
+@pytest.mark.parametrize("channel", SINGLE_DEVICE_CHANNELS)
+def test_single_device_channels_cannot_be_sharded(channel):
+    with pytest.raises(ValueError, match="single device"):
+        run_campaign(channel=channel, shards=2)
+
+
+def test_unknown_channel_rejected():
+    with pytest.raises(ValueError, match="Unknown channel"):
+        run_campaign(channel="fax")
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    """Temporary data/ dir with 30 contacts and a stub gateway that records each number."""
+    received = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            received.extend(body["phoneNumbers"])
+            self.send_response(202)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    numbers = [f"07{i:08d}" for i in range(30)]
+    (tmp_path / "data").mkdir()
+    (tmp_path / "data" / "contacts.csv").write_text("\n".join(numbers) + "\n")
+    profile = tmp_path / "test.yaml"
+    profile.write_text(f"SMS_GATEWAYS:\n  - {{name: stub, ip: 127.0.0.1, "
+                       f"port: {server.server_address[1]}, user: u, password: p, capacity: 8}}\n")
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv(loader.PROFILE_ENV, str(profile))
+    reload_config()  # inherited by the forked shard processes
+    yield numbers, received
+    monkeypatch.delenv(loader.PROFILE_ENV)
+    reload_config()
+    server.shutdown()
+    server.server_close()
+
+
+def test_sharded_campaign_sends_each_contact_once(workspace, tmp_path):
+    numbers, received = workspace
+    report = run_campaign("sms-gateway", shards=3, rate=None, workers=2, campaign_id="t")
+
+    assert sorted(received) == numbers
+    assert sum(m["contacts"] for m in report["per_shard"]) == len(numbers)
+    assert (report["contacts"], report["sent"], report["failed"]) == (30, 30, 0)
+    assert report["gateways"]["stub"]["sent"] == 30
+    assert json.loads((tmp_path / CAMPAIGN_DIR / "t" / "report.json").read_text())["sent"] == 30
+
+    # Shard logs merged into the SMS log (in time order) and removed
+    lines = (tmp_path / LOG_FILE).read_text().splitlines()
+    assert len(lines) == 30 and all("SUCCESS" in line for line in lines)
+    assert lines == sorted(lines, key=lambda line: line[:21])
+    assert not list((tmp_path / CAMPAIGN_DIR / "t").glob("shard-*"))
+
+    # Rerunning the same id resumes: nothing is sent twice
+    report = run_campaign("sms-gateway", shards=2, rate=None, workers=2, campaign_id="t")
+    assert (report["sent"], report["already_sent"]) == (0, 30)
+    assert len(received) == 30
+
+
+def test_summarize_totals():
+    shards = [
+        {"shard": 1, "contacts": 5, "sent": 3, "failed": 1, "suppressed": 1, "already_sent": 0,
+         "gateways": {"p1": {"sent": 3, "failures": 2, "in_flight": 0}}},
+        {"shard": 0, "contacts": 4, "sent": 4, "failed": 0, "suppressed": 0, "already_sent": 0,
+         "gateways": {"p1": {"sent": 4, "failures": 0, "in_flight": 0}}},
+    ]
+    report = _summarize("c", "sms-gateway", shards, elapsed=2.0)
+    assert (report["contacts"], report["sent"], report["failed"], report["suppressed"]) == (9, 7, 1, 1)
+    assert report["throughput"] == 3.5
+    assert [m["shard"] for m in report["per_shard"]] == [0, 1]
+    assert report["gateways"] == {"p1": {"sent": 7, "failures": 2}}
+
+
+def test_reloaded_rate_limit_paces_running_shard(workspace, monkeypatch):
+    from src import campaign
+
+    def watch_config(on_change):
+        # As if CAMPAIGN_RATE_LIMIT was edited to 100/s right after the shard started
+        on_change(loader.Config({**loader.get_config(), "CAMPAIGN_RATE_LIMIT": 100}))
+
+    monkeypatch.setattr(campaign, "watch_config", watch_config)
+    run_campaign("sms-gateway", shards=1, rate=None, campaign_id="warmup")  # imports the CSV
+    job = campaign.ShardJob(campaign_id="r", channel="sms-gateway", index=0, shards=2,
+                            log_path=LOG_FILE, workers=1, dedupe_campaign="r")
+    metrics = campaign.run_shard(job)
+    # 15 contacts in this shard at 100/s across 2 shards -> one send every 20 ms
+    assert metrics["contacts"] == 15
+    assert metrics["elapsed"] >= 14 * 0.02
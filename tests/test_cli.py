@@ -0,0 +1,68 @@
+"""
+Command-line entry point: argument parsing, dispatch and lazy imports.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from src import cli
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_cli(tmp_path, argv):
+    """Run the CLI in a fresh interpreter (in an empty data dir); report loaded modules."""
+    (tmp_path / "data").mkdir(exist_ok=True)
+    code = ("import sys\nfrom src.cli import main\n"
+            f"try:\n    main({argv!r})\nexcept SystemExit:\n    pass\n"
+            "print('requests loaded:', 'requests' in sys.modules)")
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    env.pop("SMS_AUTOMATION_PROFILE", None)
+    result = subprocess.run([sys.executable, "-c", code], cwd=tmp_path, env=env,
+                            capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    return result.stdout
+
+
+@pytest.mark.parametrize("argv", [["--help"], ["stats"], ["campaign", "--help"]])
+def test_light_commands_do_not_load_requests(tmp_path, argv):
+    assert "requests loaded: False" in run_cli(tmp_path, argv)
+
+
+def test_stats_output(tmp_path):
+    out = run_cli(tmp_path, ["stats"])
+    assert "Contacts:    0" in out and "Suppressed:  0" in out
+
+
+def test_parser_defaults():
+    args = cli.build_parser().parse_args(["send-sms", "--gateway", "--sim-slot", "1"])
+    assert args.func is cli.cmd_send_sms
+    assert (args.gateway, args.sim_slot, args.workers, args.campaign) == (True, 1, 4, None)
+
+    args = cli.build_parser().parse_args(["add-contacts", "0712345678", "--tag", "vip",
+                                          "--opt-out", "0700000000"])
+    assert (args.numbers, args.tag, args.opt_out) == (["0712345678"], ["vip"], ["0700000000"])
+
+
+def test_command_required():
+    with pytest.raises(SystemExit):
+        cli.build_parser().parse_args([])
+
+
+def test_main_dispatches_and_applies_profile(monkeypatch):
+    seen = []
+    monkeypatch.setattr(cli, "cmd_campaign", lambda args: seen.append(args))
+    monkeypatch.setenv("SMS_AUTOMATION_PROFILE", "")
+
+    assert cli.main(["--profile", "fleet-b", "campaign", "--shards", "2", "--id", "x"]) == 0
+    assert os.environ["SMS_AUTOMATION_PROFILE"] == "fleet-b"
+    (args,) = seen
+    assert (args.channel, args.shards, args.rate, args.id) == ("sms-gateway", 2, None, "x")
+
+
+def test_campaign_errors_exit_cleanly():
+    with pytest.raises(SystemExit, match="single device"):
+        cli.main(["campaign", "--channel", "call-adb", "--shards", "2"])
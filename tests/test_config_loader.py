@@ -0,0 +1,122 @@
+"""
+Config profiles: reload validation and the watcher loop.
+"""
+
+import os
+import time
+
+import pytest
+
+from src.config import loader
+from src.config.loader import ConfigWatcher, get_config, reload_config
+
+GATEWAY = "  - {name: p1, ip: 10.0.0.5, port: 8080, user: sms, %s: x}\n"
+
+
+@pytest.fixture
+def profile(tmp_path, monkeypatch):
+    path = tmp_path / "test.yaml"
+
+    def write(text):
+        path.write_text(text)
+        # mtime granularity can be coarse; make every write visible to the watcher
+        stat = os.stat(path)
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9 * write.count))
+        write.count += 1
+
+    write.count = 1
+    write("SMS_DELAY: 5\n")
+    monkeypatch.setenv(loader.PROFILE_ENV, str(path))
+    reload_config()
+    yield write
+    monkeypatch.delenv(loader.PROFILE_ENV)
+    reload_config()
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return False
+
+
+def test_profile_overrides_defaults(profile):
+    assert get_config().SMS_DELAY == 5
+    with pytest.raises(AttributeError):
+        get_config().SMS_DELAY = 1
+
+
+def test_invalid_gateway_keeps_previous_config(profile):
+    before = get_config()
+    profile("SMS_DELAY: 9\nSMS_GATEWAYS:\n" + GATEWAY % "pasword")
+    with pytest.raises(ValueError, match="p1"):
+        reload_config()
+    assert get_config() is before
+
+
+def test_unknown_setting_rejected(profile):
+    profile("SMS_DELAYY: 9\n")
+    with pytest.raises(ValueError, match="SMS_DELAYY"):
+        reload_config()
+    assert get_config().SMS_DELAY == 5
+
+
+def test_watcher_survives_bad_edits_and_callback_errors(profile):
+    seen = []
+
+    def on_change(config):
+        seen.append(config.SMS_DELAY)
+        if config.SMS_DELAY == 6:
+            raise ValueError("callback failed")
+
+    watcher = ConfigWatcher(interval=0.05, on_change=on_change).start()
+    try:
+        profile("SMS_DELAY: 6\n")
+        assert wait_for(lambda: seen == [6])
+
+        profile("SMS_DELAY: 9\nSMS_GATEWAYS:\n" + GATEWAY % "pasword")
+        time.sleep(0.3)
+        assert get_config().SMS_DELAY == 6
+
+        profile("SMS_DELAY: 7\nSMS_GATEWAYS:\n" + GATEWAY % "password")
+        assert wait_for(lambda: get_config().SMS_DELAY == 7)
+        assert get_config().SMS_GATEWAYS[0]["ip"] == "10.0.0.5"
+        assert seen == [6, 7]
+    finally:
+        watcher.stop()
+
+
+def test_single_gateway_keys_build_the_default_fleet(profile):
+    profile("SMS_GATEWAY_IP: 10.0.0.5\nSMS_GATEWAY_PASS: secret\n")
+    gateways = reload_config().SMS_GATEWAYS
+    assert len(gateways) == 1
+    assert (gateways[0]["ip"], gateways[0]["password"]) == ("10.0.0.5", "secret")
+
+
+def test_explicit_fleet_wins_over_single_gateway_keys(profile):
+    profile("SMS_GATEWAY_IP: 10.0.0.9\nSMS_GATEWAYS:\n" + GATEWAY % "password")
+    assert [g["ip"] for g in reload_config().SMS_GATEWAYS] == ["10.0.0.5"]
+
+
+@pytest.mark.parametrize("text", [
+    'SMS_DELAY: "1s"\n',
+    "CALL_DURATION: null\n",
+    "CALL_DURATION: true\n",
+    "SMS_MESSAGE: 42\n",
+    "SMS_GATEWAYS: phone-1\n",
+    "CAMPAIGN_RATE_LIMIT: fast\n",
+])
+def test_wrongly_typed_values_rejected(profile, text):
+    before = get_config()
+    profile(text)
+    with pytest.raises(ValueError, match="must be"):
+        reload_config()
+    assert get_config() is before
+
+
+def test_numbers_and_optional_settings_accepted(profile):
+    profile("SMS_DELAY: 0.5\nCAMPAIGN_RATE_LIMIT: 20\nTRACE_FILE: null\n")
+    config = reload_config()
+    assert (config.SMS_DELAY, config.CAMPAIGN_RATE_LIMIT, config.TRACE_FILE) == (0.5, 20, None)
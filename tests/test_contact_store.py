@@ -0,0 +1,47 @@
+"""
+Contact store: CSV seeding and the stale-CSV warning.
+"""
+
+import os
+
+from src.utils.contact_store import open_contacts
+
+
+def test_csv_imported_once_and_edits_warned(tmp_path, capsys):
+    db, csv_path = str(tmp_path / "contacts.db"), tmp_path / "contacts.csv"
+    csv_path.write_text("0712345678\n0784jghtf\n")
+
+    with open_contacts(db, str(csv_path)) as store:
+        assert list(store.iter_numbers()) == ["0712345678"]
+    assert "Imported 1 contacts" in capsys.readouterr().out
+
+    with open_contacts(db, str(csv_path)):
+        pass
+    assert capsys.readouterr().out == ""
+
+    csv_path.write_text("0712345678\n0712345679\n")
+    stat = os.stat(csv_path)
+    os.utime(csv_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    with open_contacts(db, str(csv_path)) as store:
+        assert len(store) == 1  # not re-read automatically
+        store.import_csv(str(csv_path))
+    assert "--import" in capsys.readouterr().out
+
+    with open_contacts(db, str(csv_path)) as store:
+        assert len(store) == 2
+    assert capsys.readouterr().out == ""
+
+
+def test_add_contact_tags_existing_number(tmp_path, monkeypatch):
+    import add_contacts
+    from src.utils import contact_store
+
+    db = str(tmp_path / "contacts.db")
+    monkeypatch.setattr(add_contacts, "open_contacts",
+                        lambda: contact_store.open_contacts(db, str(tmp_path / "none.csv")))
+
+    assert add_contacts.add_contact("0712345678")
+    assert not add_contacts.add_contact("+254712345678", ["vip"])
+    with contact_store.ContactStore(db) as store:
+        assert len(store) == 1
+        assert list(store.iter_numbers("vip")) == ["0712345678"]
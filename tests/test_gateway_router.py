@@ -0,0 +1,154 @@
+"""
+Gateway router failover, against local stub SMS Gateway servers.
+"""
+
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src import sms_sender
+from src.utils.gateway_router import Gateway, GatewayRouter, validate_gateways
+
+
+def start_stub(statuses):
+    """Stub gateway answering POST /message with `statuses` in order (then 202)."""
+    replies = list(statuses)
+    hits = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            hits.append(time.monotonic())
+            self.send_response(replies.pop(0) if replies else 202)
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    server.hits = hits
+    return server
+
+
+def gateway(name, server=None, port=None, **kwargs):
+    port = server.server_address[1] if server else port
+    return Gateway(name=name, ip="127.0.0.1", port=port, user="sms", password="x", **kwargs)
+
+
+@pytest.fixture
+def stubs():
+    servers = []
+    yield lambda statuses=(): servers.append(start_stub(statuses)) or servers[-1]
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def test_single_phone_retries_after_server_error(logged, stubs):
+    server = stubs([500])
+    router = GatewayRouter([gateway("p1", server)], cooldown=30)
+
+    assert sms_sender.send_sms_routed(router, "0712345678", "hi")
+    assert sms_sender.send_sms_routed(router, "0712345679", "hi")
+    assert len(server.hits) == 3
+    assert [entry[0] for entry in logged] == ["success", "success"]
+
+
+def test_client_error_does_not_take_phone_down(logged, stubs):
+    bad, good = stubs([400]), stubs()
+    router = GatewayRouter([gateway("p1", bad, weight=10), gateway("p2", good)], cooldown=30)
+
+    assert sms_sender.send_sms_routed(router, "0712345678", "hi")
+    assert router.stats()["p1"]["failures"] == 1
+    assert router.gateways[0].is_healthy(time.monotonic())
+
+
+def test_server_error_fails_over_and_cools_down(logged, stubs):
+    bad, good = stubs([503]), stubs()
+    router = GatewayRouter([gateway("p1", bad, weight=10), gateway("p2", good)], cooldown=30)
+
+    assert sms_sender.send_sms_routed(router, "0712345678", "hi")
+    stats = router.stats()
+    assert stats["p1"]["failures"] == 1 and stats["p2"]["sent"] == 1
+    assert not router.gateways[0].is_healthy(time.monotonic())
+
+    # While p1 cools down everything goes to p2
+    assert sms_sender.send_sms_routed(router, "0712345679", "hi")
+    assert len(bad.hits) == 1 and len(good.hits) == 2
+
+
+def test_connection_error_retries_on_other_phone(logged, stubs):
+    good = stubs()
+    dead = gateway("dead", port=1, weight=10)
+    router = GatewayRouter([dead, gateway("p2", good)], cooldown=30)
+
+    assert sms_sender.send_sms_routed(router, "0712345678", "hi")
+    assert router.stats()["dead"]["failures"] == 1
+
+
+def test_acquire_waits_for_cooldown_instead_of_giving_up():
+    router = GatewayRouter([gateway("p1", port=1)], cooldown=0.2)
+    router.gateways[0].down_until = time.monotonic() + 0.2
+
+    start = time.monotonic()
+    assert router.acquire(timeout=2).name == "p1"
+    assert 0.15 < time.monotonic() - start < 1.5
+
+
+def test_acquire_timeout_while_cooling_down():
+    router = GatewayRouter([gateway("p1", port=1)], cooldown=10)
+    router.gateways[0].down_until = time.monotonic() + 10
+    assert router.acquire(timeout=0.1) is None
+
+
+def test_last_healthy_phone_never_cools_down():
+    router = GatewayRouter([gateway("p1", port=1), gateway("p2", port=2)], cooldown=30)
+    first, second = router.gateways
+
+    router.release(router.acquire(exclude={"p2"}), ok=False, unhealthy=True)
+    router.release(router.acquire(exclude={"p1"}), ok=False, unhealthy=True)
+    now = time.monotonic()
+    assert not first.is_healthy(now)
+    assert second.is_healthy(now)
+
+
+def test_sim_slots_rotate():
+    router = GatewayRouter([gateway("p1", port=1, sim_slots=[0, 1])])
+    g = router.gateways[0]
+    assert [router.next_sim_slot(g) for _ in range(4)] == [0, 1, 0, 1]
+
+
+@pytest.mark.parametrize("field, value, message", [
+    ("weight", 0, "weight"),
+    ("capacity", 0, "capacity"),
+    ("sim_slots", [], "sim_slots"),
+    ("pasword", "x", "pasword"),
+])
+def test_invalid_gateway_entries_rejected(field, value, message):
+    entry = {"name": "p1", "ip": "127.0.0.1", "port": 1, "user": "sms", "password": "x",
+             field: value}
+    with pytest.raises(ValueError, match=f"p1.*{message}"):
+        validate_gateways([entry])
+    with pytest.raises(ValueError, match=message):
+        GatewayRouter([gateway("p0", port=1)]).update_gateways([entry])
+
+
+def test_unexpected_send_errors_are_logged(logged, monkeypatch, tmp_path):
+    from src.utils.idempotency import SentLog
+    from src.utils.suppression import SuppressionList
+
+    def broken(*args):
+        raise RuntimeError("boom")
+
+    monkeypatch.setattr(sms_sender, "iter_contacts", lambda: iter(["0712345678", "0712345679"]))
+    monkeypatch.setattr(sms_sender, "open_suppression",
+                        lambda: SuppressionList(str(tmp_path / "suppression.db")))
+    monkeypatch.setattr(sms_sender, "SentLog", lambda: SentLog(str(tmp_path / "sent.db")))
+    monkeypatch.setattr(sms_sender, "send_and_record", broken)
+
+    sms_sender.main(use_gateway=True, workers=2)
+    assert sorted(logged) == [("failed", "0712345678", "Unexpected error: boom"),
+                              ("failed", "0712345679", "Unexpected error: boom")]
@@ -0,0 +1,59 @@
+"""
+Sent log: rerun dedupe and recording only real sends.
+"""
+
+import pytest
+
+from src import sms_sender
+from src.utils.idempotency import SentLog, message_key
+
+
+@pytest.fixture
+def sent_log(tmp_path):
+    with SentLog(str(tmp_path / "sent.db")) as log:
+        yield log
+
+
+def test_key_ignores_number_format():
+    assert message_key("c", "0712345678", "hi") == message_key("c", "+254 712 345 678", "hi")
+    assert message_key("c", "0712345678", "hi") != message_key("c", "0712345678", "hello")
+    assert message_key("c", "0712345678", "hi") != message_key("d", "0712345678", "hi")
+
+
+def test_mark_and_expire(sent_log):
+    sent_log.mark_sent("c", "0712345678", "hi")
+    assert sent_log.was_sent("c", "+254712345678", "hi")
+    assert not sent_log.was_sent("c", "0712345678", "changed")
+    assert sent_log.expire(ttl_days=-1) == 1
+    assert len(sent_log) == 0
+
+
+def test_only_successful_sends_are_recorded(sent_log):
+    results = {"0711111111": True, "0722222222": False}
+    send = lambda number, message: results[number]
+
+    for number in results:
+        sms_sender.send_and_record(sent_log, "c", send, number, "hi")
+    assert sent_log.was_sent("c", "0711111111", "hi")
+    assert not sent_log.was_sent("c", "0722222222", "hi")
+
+
+@pytest.mark.parametrize("stderr", [
+    "ADB error: [Errno 2] No such file or directory: 'adb'",
+    "error: no devices/emulators found",
+])
+def test_adb_errors_are_not_recorded_as_sent(sent_log, logged, monkeypatch, stderr):
+    monkeypatch.setattr(sms_sender, "run_adb", lambda command: ("", stderr))
+
+    assert not sms_sender.send_and_record(sent_log, "c", sms_sender.send_sms, "0712345678", "hi")
+    assert not sent_log.was_sent("c", "0712345678", "hi")
+    assert logged[0][:2] == ("failed", "0712345678")
+    assert logged[0][2].startswith("ADB error")
+
+
+def test_adb_success_is_recorded(sent_log, logged, monkeypatch):
+    monkeypatch.setattr(sms_sender, "run_adb", lambda command: ("Starting: Intent", ""))
+
+    assert sms_sender.send_and_record(sent_log, "c", sms_sender.send_sms, "0712345678", "hi")
+    assert sent_log.was_sent("c", "0712345678", "hi")
+    assert logged == [("success", "0712345678")]
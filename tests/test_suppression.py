@@ -0,0 +1,98 @@
+"""
+Suppression list: Bloom filter and which logged failures suppress a number.
+"""
+
+import os
+import shutil
+
+import pytest
+
+from src.utils.suppression import BloomFilter, SuppressionList
+
+
+@pytest.fixture
+def suppression(tmp_path):
+    with SuppressionList(str(tmp_path / "suppression.db")) as s:
+        yield s
+
+
+def write_log(tmp_path, lines, name="log.txt"):
+    path = tmp_path / name
+    path.write_text("".join(f"[2025-12-04 10:00:{i:02d}] FAILED - {line}\n"
+                            for i, line in enumerate(lines)))
+    return str(path)
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    keys = [str(254700000000 + i) for i in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(str(254800000000 + i) in bloom for i in range(10000))
+    assert false_positives < 300
+
+
+def test_opt_out_matches_any_number_format(suppression):
+    suppression.add("0712345678")
+    assert "+254712345678" in suppression
+    assert "0712345679" not in suppression
+    assert suppression.remove("712345678")
+    assert "0712345678" not in suppression
+
+
+@pytest.mark.parametrize("error", [
+    "p1: 401 Client Error: Unauthorized for url: http://10.0.0.5:8080/message",
+    "p1: 500 Server Error: Internal Server Error for url: http://10.0.0.5:8080/message",
+    "MacroDroid webhook returned: 503",
+    "MacroDroid webhook URL not configured correctly",
+    "ADB error: error: no devices/emulators found",
+    "No healthy SMS gateway available",
+    "Start call error: No call_id returned by API",
+    "Authentication failed - check username/password",
+    "Connection error - check device IP and port",
+    "No active call found",
+    "End call failed: 404",
+    "p1: 400 Client Error: invalid destination 0712345678",
+])
+def test_setup_errors_never_suppress(suppression, tmp_path, error):
+    log = write_log(tmp_path, [f"0712345678 - {error}"] * 5)
+    assert suppression.import_logs([log]) == 0
+    assert "0712345678" not in suppression
+
+
+def test_number_errors_suppress(suppression, tmp_path):
+    log = write_log(tmp_path, [
+        "0784jghtf - Invalid number format",
+        "0711111111 - Recipient opted out",
+        "0784jghtf - Invalid number format",
+    ])
+    assert suppression.import_logs([log]) == 2
+    assert "0784jghtf" in suppression
+    assert "0711111111" in suppression
+
+
+def test_valid_number_logged_as_invalid_is_kept(suppression, tmp_path):
+    # An older validator rejected "+254..." numbers that are valid today
+    log = write_log(tmp_path, ["+254701588751 - Invalid number format"])
+    assert suppression.import_logs([log]) == 0
+    assert "0701588751" not in suppression
+
+
+def test_log_scan_is_incremental(suppression, tmp_path):
+    log = write_log(tmp_path, ["0784jghtf - Invalid number format"])
+    assert suppression.import_logs([log]) == 1
+    suppression.remove("0784jghtf")
+    assert suppression.import_logs([log]) == 0  # same lines not rescanned
+    with open(log, "a") as f:
+        f.write("[2025-12-04 10:01:00] FAILED - 0711111111 - Opted out\n")
+    assert suppression.import_logs([log]) == 1
+
+
+def test_repo_call_log_keeps_real_contacts(suppression, tmp_path):
+    log = str(tmp_path / "call_log.txt")
+    shutil.copy(os.path.join(os.path.dirname(__file__), "..", "data", "call_log.txt"), log)
+    suppression.import_logs([log])
+    for number in ("0701588751", "0717697911", "0731305183", "0742684062"):
+        assert number not in suppression
+    assert "0784jghtf" in suppression
@@ -0,0 +1,38 @@
+"""
+Tracing: restarting in a worker and merging shard samples.
+"""
+
+import json
+import time
+
+from src.utils import tracing
+
+
+def test_start_discards_inherited_samples(tmp_path):
+    tracing.start(str(tmp_path / "parent.json"), 0.001)
+    time.sleep(0.05)
+    inherited = tracing._sampler
+    assert inherited.stacks
+
+    # What a forked campaign shard does: start again without sampling
+    tracing.start(str(tmp_path / "shard.json"))
+    assert tracing.sample_interval() is None
+    with tracing.span("work"):
+        pass
+    tracing.stop()
+    inherited.stop()
+
+    assert not (tmp_path / "shard.json.folded").exists()
+    events = json.loads((tmp_path / "shard.json").read_text())["traceEvents"]
+    assert [e["name"] for e in events if e["ph"] == "X"] == ["work"]
+
+
+def test_merge_folded_sums_stacks(tmp_path):
+    a, b = tmp_path / "a.folded", tmp_path / "b.folded"
+    a.write_text("main;run_shard;send 3\nmain;run_shard 1\n")
+    b.write_text("main;run_shard;send 2\n")
+    target = tmp_path / "trace.json.folded"
+
+    tracing.merge_folded([str(a), str(b), str(tmp_path / "missing.folded")], str(target))
+    assert target.read_text().splitlines() == ["main;run_shard;send 5", "main;run_shard 1"]
+    assert not a.exists() and not b.exists()